@@ -1,81 +1,40 @@
+import threading
 import time
-import tkinter as tk
-from collections import deque
-from heapq import heapify, heappush, heappop
-import math
-
-class PuzzleState:
-    # Each Puzzle State has:
-    # state : which is the shape of the puzzle
-    # parent : which is the node that added this state in the frontier list
-    # action : the move made to get from the parent to this node
-    # costType : to indicate which heuristic to use in case of A* (0--> no cost , 1--> Manhattan , 2--> Euclidean)
-    def __init__(self, state, parent=None, action=None, costType=0):
-        self.state = state
-        self.parent = parent
-        self.action = action
-        self.costType = costType
-        if costType == 1:
-            self.cost = self.get_manhattan_distance(self.state) + parent.cost if parent else self.get_manhattan_distance(self.state)
-        elif costType == 2:
-            self.cost = self.get_euclidean_distance(self.state) + parent.cost if parent else self.get_euclidean_distance(self.state)
-
-    # overriding equality function so that two nodes are equal if they have the same puzzle shape
-    def __eq__(self, other):
-        return self.state == other.state
-
-    def __hash__(self):
-        return hash(str(self.state))
-
-    def __str__(self):
-        return str(self.state)
-
-    def __repr__(self):
-        return self.state
-
-   # Overriding the less than function that's used by the heap
-    def __lt__(self, other):
-        return self.cost < other.cost
-
-    # Calculating Euclidean Distance from node to goal
-    def get_euclidean_distance(self, matrix1):
-        cost = 0
-        for i in range(3):
-            for j in range(3):
-                tile = matrix1[i][j]
-                goal_row, goal_col = divmod(tile, 3)
-                cost += math.sqrt((i - goal_row) ** 2 + (j - goal_col) ** 2)
-        return cost
-
-    # Calculating Manhattan Distance from node to goal
-    def get_manhattan_distance(self, matrix1):
-        cost = 0
-        for i in range(3):
-            for j in range(3):
-                tile = matrix1[i][j]
-                goal_row, goal_col = divmod(tile , 3)
-                cost += abs(i - goal_row) + abs(j - goal_col)
-        return cost
-
-    # Decreasing the cost of a state in case the parent is changed
-    def decreaseKey(self,node):
-        if self.costType == 1:
-            self.cost = self.get_manhattan_distance(self.state) + node.cost
-        elif self.costType == 2:
-            self.cost = self.get_euclidean_distance(self.state) + node.cost
-
-        self.parent = node
-
+from puzzle_solver import heuristics, oracle, validation
+from puzzle_solver.api import solve
+from puzzle_solver.cache import SolutionCache
+from puzzle_solver.progress import Progress, SearchCancelled
 
 
 class Game:
+    # Button code --> (algorithm in puzzle_solver.api, heuristic, window title); 6 builds the oracle table
+    ALGORITHMS = {
+        1: ("bfs", None, "BFS"),
+        2: ("dfs", None, "DFS"),
+        3: ("astar", "manhattan", "A* Manhattan"),
+        4: ("astar", "euclidean", "A* Euclidean"),
+        5: ("oracle", None, "Oracle"),
+        7: ("ida_star", "manhattan", "IDA* Manhattan"),
+        8: ("astar", "pattern_database", "A* Pattern DB"),
+        9: ("astar", None, "A*"),
+        10: ("depth_limited_dfs", None, "Depth-limited DFS"),
+        11: ("iterative_deepening_dfs", None, "IDDFS"),
+    }
+
     # Initializing the game's GUI and stating the goal state
     def __init__(self):
+        # The toolkit is only needed once the window is opened, so headless imports of this file stay Tk-free
+        import tkinter as tk
+
         self.root = tk.Tk()
         self.root.title("8-Puzzle Solver")
         self.random_initial_state = None
         self.goal_state = [[0, 1, 2], [3, 4, 5], [6, 7, 8]]
         self.solution_path = None
+        # Searches run on a worker thread; progress is polled from the Tk loop
+        self.search_thread = None
+        self.search_outcome = None
+        self.progress = None
 
         self.cell_var = [[tk.StringVar() for _ in range(3)] for _ in range(3)]
 
@@ -111,7 +70,70 @@ class Game:
                                             bg="blue", fg="white", font=("Helvetica", 14), relief="raised")
         a_star_euclidean_button.grid(row=6, column=3, padx=10, pady=10, sticky='nsew')
 
-        for i in range(7):
+        # BFS and DFS can run on packed-integer states instead of PuzzleState objects
+        self.packed_mode = tk.BooleanVar(value=False)
+        packed_check = tk.Checkbutton(self.root, text="Packed engine", variable=self.packed_mode,
+                                      font=("Helvetica", 12))
+        packed_check.grid(row=7, columnspan=3, pady=10)
+
+        # Optimal searches are answered from the paths already found in this session
+        self.solution_cache = SolutionCache()
+        self.reuse_solutions = tk.BooleanVar(value=True)
+        reuse_check = tk.Checkbutton(self.root, text="Reuse solutions", variable=self.reuse_solutions,
+                                     font=("Helvetica", 12))
+        reuse_check.grid(row=7, column=3, pady=10)
+
+        oracle_button = tk.Button(self.root, text="Oracle", command=lambda: self.run_algorithm(5), bg="brown",
+                                  fg="white", font=("Helvetica", 14), relief="raised")
+        oracle_button.grid(row=8, column=0, padx=10, pady=10, sticky='nsew')
+
+        build_table_button = tk.Button(self.root, text="Build Oracle Table", command=lambda: self.run_algorithm(6),
+                                       bg="gray", fg="white", font=("Helvetica", 14), relief="raised")
+        build_table_button.grid(row=8, column=1, padx=10, pady=10, sticky='nsew')
+
+        ida_star_button = tk.Button(self.root, text="IDA* Manhattan", command=lambda: self.run_algorithm(7),
+                                    bg="darkgreen", fg="white", font=("Helvetica", 14), relief="raised")
+        ida_star_button.grid(row=8, column=2, padx=10, pady=10, sticky='nsew')
+
+        a_star_pdb_button = tk.Button(self.root, text="A* Pattern DB", command=lambda: self.run_algorithm(8),
+                                      bg="teal", fg="white", font=("Helvetica", 14), relief="raised")
+        a_star_pdb_button.grid(row=8, column=3, padx=10, pady=10, sticky='nsew')
+
+        # A* with any heuristic from the registry
+        heuristic_names = heuristics.names()
+        self.heuristic_choice = tk.StringVar(value=heuristic_names[0])
+        heuristic_menu = tk.OptionMenu(self.root, self.heuristic_choice, *heuristic_names)
+        heuristic_menu.config(font=("Helvetica", 12))
+        heuristic_menu.grid(row=9, column=0, columnspan=2, padx=10, pady=10, sticky='nsew')
+
+        a_star_button = tk.Button(self.root, text="A*", command=lambda: self.run_algorithm(9), bg="green",
+                                  fg="white", font=("Helvetica", 14), relief="raised")
+        a_star_button.grid(row=9, column=2, padx=10, pady=10, sticky='nsew')
+
+        # Live progress of the running search and a button to stop it
+        self.progress_label = tk.Label(self.root, text="", font=("Helvetica", 12))
+        self.progress_label.grid(row=10, column=0, columnspan=3, padx=10, pady=10, sticky='nsew')
+
+        cancel_button = tk.Button(self.root, text="Cancel", command=self.cancel_search, bg="red", fg="white",
+                                  font=("Helvetica", 14), relief="raised")
+        cancel_button.grid(row=10, column=3, padx=10, pady=10, sticky='nsew')
+
+        # Memory-bounded DFS variants; the depth limit also caps IDA* (empty = no limit)
+        dls_button = tk.Button(self.root, text="Depth-limited DFS", command=lambda: self.run_algorithm(10),
+                               bg="purple", fg="white", font=("Helvetica", 14), relief="raised")
+        dls_button.grid(row=11, column=0, padx=10, pady=10, sticky='nsew')
+
+        iddfs_button = tk.Button(self.root, text="IDDFS", command=lambda: self.run_algorithm(11), bg="purple",
+                                 fg="white", font=("Helvetica", 14), relief="raised")
+        iddfs_button.grid(row=11, column=1, padx=10, pady=10, sticky='nsew')
+
+        depth_limit_label = tk.Label(self.root, text="Depth limit", font=("Helvetica", 12))
+        depth_limit_label.grid(row=11, column=2, padx=10, pady=10, sticky='nsew')
+
+        self.depth_limit_entry = tk.Entry(self.root, font=("Helvetica", 12), justify="center")
+        self.depth_limit_entry.grid(row=11, column=3, padx=10, pady=10, sticky='nsew')
+
+        for i in range(12):
             self.root.grid_rowconfigure(i, weight=1)
             self.root.grid_columnconfigure(i, weight=1)
 
@@ -133,169 +155,103 @@ class Game:
                 self.cell_var[i][j].set(state[i][j])
 
     # Calling of Searching Algorithms and calculating the time taken.
+    # The search itself runs on a worker thread so the window stays responsive.
     def run_algorithm(self, algorithm):
-        start = 0
-        end = 0
-        if algorithm == 1:
-            start = time.time()
-            self.solution_path = self.bfs(self.random_initial_state, self.goal_state)
-            end = time.time()
-            self.root.title("8-Puzzle Solver BFS")
-        elif algorithm == 2:
-            start = time.time()
-            self.solution_path = self.dfs(self.random_initial_state, self.goal_state)
-            end = time.time()
-            self.root.title("8-Puzzle Solver DFS")
-        elif algorithm == 3:
-            start = time.time()
-            self.solution_path = self.A_star(self.random_initial_state, self.goal_state, cost=1)
-            end = time.time()
-            self.root.title("8-Puzzle Solver A* Manhattan")
-        elif algorithm == 4:
+        if self.search_thread is not None:
+            print("A search is already running, cancel it first.")
+            return
+
+        if algorithm == 6:
+            # (Re)building the exact-distance table used by the oracle
             start = time.time()
-            self.solution_path = self.A_star(self.random_initial_state, self.goal_state, cost=2)
+            oracle.build_table()
             end = time.time()
-            self.root.title("8-Puzzle Solver A* Euclidean")
-
-        print("Time Taken by Algorithm = " + str(end - start))
+            print("Time Taken to build the distance table = " + str(end - start))
+            self.arrow_label.config(text="Table Built")
+            return
+
+        name, heuristic, title = self.ALGORITHMS[algorithm]
+        if algorithm == 9:
+            heuristic = self.heuristic_choice.get()
+            title = "A* " + heuristic
+        try:
+            max_depth = int(self.depth_limit_entry.get()) if self.depth_limit_entry.get().strip() else None
+        except ValueError:
+            print("Invalid depth limit. Please enter a whole number of moves.")
+            return
+        if name in ("bfs", "dfs") and self.packed_mode.get():
+            name = "packed_" + name
+            title += " (packed)"
 
+        # Malformed or unsolvable boards are rejected before launching any search
+        try:
+            validation.validate(self.random_initial_state, self.goal_state)
+        except validation.UnsolvableBoardError as error:
+            print(error)
+            self.arrow_label.config(text="Unsolvable")
+            return
+        except validation.InvalidBoardError as error:
+            print(error)
+            self.arrow_label.config(text="Invalid Board")
+            return
+        self.root.title("8-Puzzle Solver " + title)
+
+        self.progress = Progress()
+        self.search_outcome = None
+        cache = self.solution_cache if self.reuse_solutions.get() else None
+        self.search_thread = threading.Thread(target=self.search_worker,
+                                              args=(name, heuristic, max_depth, self.progress, cache), daemon=True)
+        self.search_thread.start()
+        self.root.after(100, self.poll_search, title)
+
+    # Running the search off the Tk thread; poll_search picks up the result or the exception
+    def search_worker(self, name, heuristic, max_depth, progress, cache):
+        try:
+            self.search_outcome = solve(self.random_initial_state, name, heuristic, self.goal_state, progress,
+                                        max_depth=max_depth, cache=cache)
+        except Exception as error:
+            self.search_outcome = error
+
+    # Showing the live counters every 100 ms until the worker finishes
+    def poll_search(self, title):
+        progress = self.progress
+        self.progress_label.config(text="Expanded: " + str(progress.nodes_expanded) +
+                                   "   Frontier: " + str(progress.frontier_size) +
+                                   "   Elapsed: " + str(round(progress.elapsed(), 1)) + " s")
+        if self.search_thread.is_alive():
+            self.root.after(100, self.poll_search, title)
+            return
+
+        self.search_thread = None
+        result = self.search_outcome
+        if isinstance(result, SearchCancelled):
+            print(result)
+            self.arrow_label.config(text="Cancelled")
+            return
+        if isinstance(result, Exception):
+            raise result
+
+        if result.stats["cache_hit"]:
+            print("Solution reused from an earlier search")
+        print("Time Taken by Algorithm = " + str(result.stats["time"]))
+        if "nodes_visited" in result.stats:
+            print("Number of nodes visited by " + title + " = " + str(result.stats["nodes_visited"]))
+            print("Max Number of nodes in memory = " + str(result.stats["max_nodes_in_memory"]))
+        if "cost" in result.stats:
+            print("Cost by " + title + " = " + str(result.stats["cost"]))
+
+        self.solution_path = result.path
         if self.solution_path is not None:
+            print("Number of nodes in Path by " + title + " = " + str(len(self.solution_path)))
             self.update_gui_with_solution_path()
         else:
             # Display a message in the GUI indicating no solution
             self.arrow_label.config(text="No Solution")
 
-    # BFS Search
-    def bfs(self, initial_state, goal_state):
-        start_node = PuzzleState(initial_state)
-        goal_node = PuzzleState(goal_state)
-
-        queue = deque([start_node])
-        visited = set()
-
-        nodes_in_memory = []
-        while queue:
-            current_node = queue.popleft()
-            nodes_in_memory.append(len(queue)+len(visited))
-            if current_node == goal_node:
-                print("Number of nodes visited by BFS = " + str(len(visited)))
-                print("Max Number of nodes in memory = " + str(max(nodes_in_memory)))
-                path = self.get_path(current_node)
-                print("Number of nodes in Path by Bfs = " + str(len(path)))
-                return path
-
-            if current_node not in visited:
-                visited.add(current_node)
-
-                neighbors = self.get_neighbors(current_node.state)
-                for last_move, new_position, neighbor_state, move in neighbors:
-                    neighbor_node = PuzzleState(neighbor_state, current_node, move)
-                    if neighbor_node not in visited:
-                        queue.append(neighbor_node)
-
-        return None
-
-    # DFS Search
-    def dfs(self, initial_state, goal_state):
-        start_node = PuzzleState(initial_state)
-        goal_node = PuzzleState(goal_state)
-
-        stack = [start_node]
-        visited = set()
-
-        nodes_in_memory = []
-        while stack:
-            current_node = stack.pop()
-
-            nodes_in_memory.append(len(stack) + len(visited))
-            if current_node == goal_node:
-                print("Number of nodes visited = " + str(len(visited)))
-                print("Max Number of nodes in memory = " + str(max(nodes_in_memory)))
-                path = self.get_path(current_node)
-                print("Number of nodes in Path = " + str(len(path)))
-                return path
-
-            if current_node not in visited:
-                visited.add(current_node)
-
-                neighbors = self.get_neighbors(current_node.state)
-                for last_move, new_position, neighbor_state, move in neighbors:
-                    neighbor_node = PuzzleState(neighbor_state, current_node, move)
-                    if neighbor_node not in visited:
-                        stack.append(neighbor_node)
-
-        return None
-
-    # A* search
-    def A_star(self, initial_state, goal_state, cost):
-        start_node = PuzzleState(initial_state, costType=cost)
-        goal_node = PuzzleState(goal_state, costType=cost)
-
-        heap = [start_node]
-        heapify(heap)
-        visited = set()
-
-        nodes_in_memory = []
-        while heap:
-            current_node = heappop(heap)
-
-            nodes_in_memory.append(len(heap) + len(visited))
-            if current_node == goal_node:
-                print("Number of nodes visited by A* = " + str(len(visited)))
-                print("Max Number of nodes in memory = " + str(max(nodes_in_memory)))
-                path = self.get_path(current_node)
-                print("Number of nodes in Path by A* = " + str(len(path)))
-                print("Cost by A* = " + str(current_node.cost))
-                return path
-
-            if current_node not in visited:
-                visited.add(current_node)
-
-                neighbors = self.get_neighbors(current_node.state)
-                for last_move, new_position, neighbor_state, move in neighbors:
-                    neighbor_node = PuzzleState(neighbor_state, current_node, move, costType=cost)
-                    if neighbor_node not in visited and neighbor_node not in heap:
-                        heappush(heap, neighbor_node)
-                    elif neighbor_node in heap:
-                        neighbor_node.decreaseKey(current_node)
-                        heapify(heap)
-
-        return None
-
-    # Finding the blank tile position
-    def get_blank_position(self, state):
-        for i in range(3):
-            for j in range(3):
-                if state[i][j] == 0:
-                    return i, j
-
-    # Getting neighbors of a state
-    def get_neighbors(self, state):
-        i, j = self.get_blank_position(state)
-        neighbors = []
-
-        # All possible moves
-        moves = [(0, 1), (1, 0), (0, -1), (-1, 0)]
-
-        for move in moves:
-            new_i, new_j = i + move[0], j + move[1]
-
-            # Checking that it's not out of border
-            if 0 <= new_i < 3 and 0 <= new_j < 3:
-                new_state = [row.copy() for row in state]
-                new_state[i][j], new_state[new_i][new_j] = new_state[new_i][new_j], new_state[i][j]
-                neighbors.append(((i, j), (new_i, new_j), new_state, move))
-
-        return neighbors
-
-    # Getting the solution path
-    def get_path(self, current_node):
-        path = []
-        while current_node.parent:
-            path.insert(0, (current_node.state, current_node.action))
-            current_node = current_node.parent
-        path.insert(0, (current_node.state, None))
-        return path
+    # Asking the running search to stop at its next progress report
+    def cancel_search(self):
+        if self.search_thread is not None:
+            self.progress.cancel()
 
     # Updating the arrow in the GUI
     def update_gui_with_arrow(self, state, move):
@@ -322,4 +278,5 @@ class Game:
             self.root.after(1000, self.update_gui_with_solution_path)
 
 # Starting the Game
-game = Game()
\ No newline at end of file
+if __name__ == "__main__":
+    game = Game()
@@ -1,117 +1,189 @@
+import heapq
+import sys
+from itertools import count
+
+from puzzle_solver import heuristics, packed
+from puzzle_solver.budget import Budget, BudgetExceeded
+from puzzle_solver.idastar import ida_star
+from puzzle_solver.metrics import SearchMetrics
+from puzzle_solver.validation import InvalidBoardError, validate
+
+# Size-generic A* for the n x n puzzle.
+# Boards are flat tuples (row-major, 0 is the blank) and the open list is a binary heap. Expanded
+# boards go to a hashed closed set, so no board is expanded twice. h is the Manhattan distance to
+# the goal, updated from the moved tile only.
+#
+#   Puzzle(3).solve([[1, 2, 5], [3, 4, 0], [6, 7, 8]], [[0, 1, 2], [3, 4, 5], [6, 7, 8]])
+#
+# Running this file reads both matrices from stdin instead and prints the boards along the path;
+# `python Astar.py 4 30` works on 4x4 boards and gives up after 30 seconds.
+
+
 class Node:
-    def __init__(self,data,level,fval):
+    __slots__ = ("data", "level", "fval", "blank", "parent", "move")
 
+    # data : flat tuple board, level : moves from the start, fval : level + h, blank : the blank's cell,
+    # parent / move : the node this one was generated from and the move of the blank that led here
+    def __init__(self, data, level, fval, blank, parent=None, move=None):
         self.data = data
         self.level = level
         self.fval = fval
+        self.blank = blank
+        self.parent = parent
+        self.move = move
 
-    def generate_child(self):
-
-        x,y = self.find(self.data,'0')
-
-        val_list = [[x,y-1],[x,y+1],[x-1,y],[x+1,y]]
+    # One child per move that stays on the board; only the tile that slid changes h
+    def generate_child(self, neighbors, table):
+        h = self.fval - self.level
         children = []
-        for i in val_list:
-            child = self.shuffle(self.data,x,y,i[0],i[1])
-            if child is not None:
-                child_node = Node(child,self.level+1,0)
-                children.append(child_node)
+        for target, move in neighbors[self.blank]:
+            tile = self.data[target]
+            child_h = h + table[tile][self.blank] - table[tile][target]
+            children.append(Node(self.shuffle(self.data, self.blank, target), self.level + 1,
+                                 self.level + 1 + child_h, target, self, move))
         return children
-        
-    def shuffle(self,puz,x1,y1,x2,y2):
-   
-        if x2 >= 0 and x2 < len(self.data) and y2 >= 0 and y2 < len(self.data):
-            temp_puz = []
-            temp_puz = self.copy(puz)
-            temp = temp_puz[x2][y2]
-            temp_puz[x2][y2] = temp_puz[x1][y1]
-            temp_puz[x1][y1] = temp
-            return temp_puz
-        else:
-            return None
-            
-
-    def copy(self,root):
-
-        temp = []
-        for i in root:
-            t = []
-            for j in i:
-                t.append(j)
-            temp.append(t)
-        return temp    
-            
-    def find(self,puz,x):
-
-        for i in range(0,len(self.data)):
-            for j in range(0,len(self.data)):
-                if puz[i][j] == x:
-                    return i,j
 
+    # Board with the tile at `target` slid into the blank cell
+    @staticmethod
+    def shuffle(data, blank, target):
+        board = list(data)
+        board[blank] = board[target]
+        board[target] = 0
+        return tuple(board)
 
-class Puzzle:
-    def __init__(self,size):
 
+class Puzzle:
+    def __init__(self, size):
         self.n = size
-        self.open = []
-        self.closed = []
 
+    # Reading an n-line matrix from stdin, tiles separated by spaces, '0' or '_' being the blank
     def accept(self):
-
         puz = []
-        for i in range(0,self.n):
+        for i in range(0, self.n):
             temp = input().split(" ")
             puz.append(temp)
         return puz
 
-    def f(self,start,goal):
-
-        return self.h(start.data,goal)+start.level
-
-    def h(self,start,goal):
-
-        temp = 0
-        for i in range(0,self.n):
-            for j in range(0,self.n):
-                if start[i][j] != goal[i][j] and start[i][j] != '_':
-                    temp += 1
-        return temp
-        
-
-    def process(self):
-        
+    def to_int(self, puz):
+        return [[0 if j in ('0', '_') else int(j) for j in i] for i in puz]
+
+    def ida_star(self, start, goal):
+        # Memory-light alternative to solve() for larger boards, '0' or '_' being the blank
+        return ida_star(self.to_int(start), self.to_int(goal))
+
+    # A* from start to goal, both lists of rows holding ints or the strings accept() reads.
+    # Returns the path as (state, move) pairs, like the GUIs' engines, or None if there is none.
+    # Raises validation.InvalidBoardError (a ValueError) for malformed or unsolvable input.
+    # budget is an optional budget.Budget; the search raises budget.BudgetExceeded when it runs out,
+    # and budget.best is then the board found closest to the goal.
+    def solve(self, start, goal, metrics=None, budget=None):
+        if metrics is None:
+            metrics = SearchMetrics()
+        start = self.to_int(start)
+        goal = self.to_int(goal)
+        if len(start) != self.n:
+            raise InvalidBoardError("Expected a " + str(self.n) + "x" + str(self.n) + " board")
+        validate(start, goal)
+        if budget is not None:
+            budget.goal_state = goal
+            budget.attach(metrics)
+
+        n = self.n
+        goal_data = tuple(tile for row in goal for tile in row)
+        table = heuristics.manhattan_table(n, goal_data)
+        neighbors = packed.neighbor_table(n)
+        data = tuple(tile for row in start for tile in row)
+        h = sum(table[tile][cell] for cell, tile in enumerate(data))
+        root = Node(data, 0, h, data.index(0))
+
+        # Ties on f go to the deeper node; the counter keeps nodes themselves from being compared
+        order = count()
+        open_heap = [(root.fval, 0, next(order), root)]
+        best_level = {data: 0}
+        closed = set()
+
+        metrics.mark("search")
+        generated = duplicates = peak_frontier = 0
+        # Expanded node of lowest h, passed to record() as the best board found so far
+        best, best_h = root, h
+        while open_heap:
+            cur = heapq.heappop(open_heap)[3]
+            if cur.data in closed:
+                duplicates += 1
+                continue
+            if cur.data == goal_data:
+                metrics.cost = cur.level
+                metrics.record(len(closed), generated, duplicates, len(open_heap), len(closed), peak_frontier,
+                               peak_frontier + len(closed))
+                metrics.mark("path")
+                return self.path(cur)
+
+            closed.add(cur.data)
+            if cur.fval - cur.level < best_h:
+                best, best_h = cur, cur.fval - cur.level
+            if not len(closed) % metrics.interval:
+                metrics.record(len(closed), generated, duplicates, len(open_heap), len(closed), peak_frontier,
+                               peak_frontier + len(closed), [list(best.data[i * n:(i + 1) * n]) for i in range(n)],
+                               best_h)
+            for child in cur.generate_child(neighbors, table):
+                generated += 1
+                # Manhattan distance is consistent, so a board reached again is never cheaper than before
+                if child.data in closed or best_level.get(child.data, child.level + 1) <= child.level:
+                    duplicates += 1
+                    continue
+                best_level[child.data] = child.level
+                heapq.heappush(open_heap, (child.fval, -child.level, next(order), child))
+            if len(open_heap) > peak_frontier:
+                peak_frontier = len(open_heap)
+
+        metrics.record(len(closed), generated, duplicates, 0, len(closed), peak_frontier,
+                       peak_frontier + len(closed))
+        return None
+
+    # Following the parents back from `node` and cutting the flat boards into rows
+    def path(self, node):
+        n = self.n
+        path = []
+        while node is not None:
+            path.append(([list(node.data[i * n:(i + 1) * n]) for i in range(n)], node.move))
+            node = node.parent
+        path.reverse()
+        return path
+
+    # Interactive front end: reading both matrices from stdin and printing every board on the path.
+    # budget is an optional budget.Budget; when it runs out the closest board found is printed instead.
+    def process(self, budget=None):
         print("Enter the start state matrix \n")
         start = self.accept()
-        print("Enter the goal state matrix \n")        
+        print("Enter the goal state matrix \n")
         goal = self.accept()
 
-        start = Node(start,0,0)
-        start.fval = self.f(start,goal)
-        
-        self.open.append(start)
+        # Rejecting malformed or unsolvable input before searching
+        try:
+            path = self.solve(start, goal, budget=budget)
+        except ValueError as error:
+            print(error)
+            return
+        except BudgetExceeded as error:
+            print(error)
+            if budget.best is not None:
+                print("Closest board found, " + str(budget.best_h) + " moves from the goal at least:")
+                for row in budget.best:
+                    print(" ".join(str(tile) for tile in row))
+            return
+
         print("\n\n")
-        while True:
-            cur = self.open[0]
+        for state, move in path:
             print("")
             print("  | ")
             print("  | ")
             print(" \\\'/ \n")
-            for i in cur.data:
+            for i in state:
                 for j in i:
-                    print(j,end=" ")
+                    print(j, end=" ")
                 print("")
-            
-            if(self.h(cur.data,goal) == 0):
-                break
-            for i in cur.generate_child():
-                i.fval = self.f(i,goal)
-                self.open.append(i)
-            self.closed.append(cur)
-            del self.open[0]
-
-            
-            self.open.sort(key = lambda x:x.fval,reverse=False)
 
 
-puz = Puzzle(3)
-puz.process()
\ No newline at end of file
+if __name__ == "__main__":
+    puz = Puzzle(int(sys.argv[1]) if len(sys.argv) > 1 else 3)
+    puz.process(Budget(deadline=float(sys.argv[2])) if len(sys.argv) > 2 else None)
@@ -0,0 +1,9 @@
+# Search engines behind the 8-Puzzle Solver GUIs, usable without a display.
+# `from puzzle_solver import solve` is resolved lazily, so importing the package stays cheap.
+
+
+def __getattr__(name):
+    if name in ("solve", "SolveResult", "ALGORITHMS"):
+        from puzzle_solver import api
+        return getattr(api, name)
+    raise AttributeError("module 'puzzle_solver' has no attribute " + repr(name))
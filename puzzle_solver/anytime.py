@@ -0,0 +1,195 @@
+import heapq
+
+from puzzle_solver import heuristics, packed, validation
+from puzzle_solver.budget import BudgetExceeded
+from puzzle_solver.idastar import replay
+from puzzle_solver.metrics import SearchMetrics
+
+# Weighted A* and anytime repairing A* (ARA*, Likhachev, Gordon and Thrun) on packed boards.
+# Weighted A* orders the open list by g + w * h. With an admissible h, the first path found is at
+# most w times longer than a shortest one, and far fewer nodes are expanded to find it.
+# ARA* runs weighted A* with a falling weight and keeps its g values between rounds. Boards whose g
+# improved after they were expanded wait in an INCONS list instead of being expanded again in the
+# same round. Each round proves a bound: the path is at most
+#   min(w, len(path) / min over OPEN and INCONS of (g + h))
+# times longer than optimal, and the search stops once it reaches 1.0.
+# The bound of the path returned is left in metrics.bound. Like every engine, both are bounded by a
+# budget.Budget on their metrics; ara_star then keeps its best path so far.
+
+
+class _Search:
+    # g values, parents and h values shared by all rounds
+    def __init__(self, initial_state, goal_state, heuristic, metrics):
+        self.n = len(initial_state)
+        self.initial_state = initial_state
+        self.neighbors = packed.neighbor_table(self.n)
+        self.start = packed.pack(initial_state)
+        self.goal = packed.pack(goal_state)
+        self.heuristic = heuristics.get(heuristic)
+        # Table heuristics are updated from the moved tile without unpacking the child
+        self.table = self.heuristic.table(self.n) if isinstance(self.heuristic, heuristics.TableHeuristic) else None
+        self.metrics = metrics
+
+        self.g = {self.start: 0}
+        self.h = {self.start: self.heuristic.evaluate(initial_state)}
+        self.parent = {self.start: None}
+        self.open = {}
+        self.heap = []
+        self.closed = set()
+        self.incons = set()
+        self.expanded = self.generated = self.duplicates = self.peak_frontier = 0
+        # Expanded board of lowest h over all rounds, passed to record() as the best board found so far
+        self.best = self.start
+
+    def push(self, code, weight):
+        g = self.g[code]
+        key = g + weight * self.h[code]
+        self.open[code] = key
+        heapq.heappush(self.heap, (key, -g, code))
+
+    # code : the best board found so far, if any
+    def record(self, code=None):
+        if code is None:
+            self.metrics.record(self.expanded, self.generated, self.duplicates, len(self.open), len(self.g),
+                                self.peak_frontier, len(self.g))
+        else:
+            self.metrics.record(self.expanded, self.generated, self.duplicates, len(self.open), len(self.g),
+                                self.peak_frontier, len(self.g), packed.unpack(code, self.n), self.h[code])
+
+    # One weighted A* round: expanding until no open board can lead to a path shorter than the goal's g
+    def improve(self, weight):
+        heap = self.heap
+        g_values = self.g
+        h_values = self.h
+        neighbors = self.neighbors
+        table = self.table
+        interval = self.metrics.interval
+        while heap:
+            key, negative_g, code = heap[0]
+            if self.open.get(code) != key:
+                heapq.heappop(heap)
+                continue
+            if g_values.get(self.goal, float("inf")) <= key:
+                return
+            heapq.heappop(heap)
+            del self.open[code]
+            self.closed.add(code)
+            self.expanded += 1
+            h = h_values[code]
+            if h < h_values[self.best]:
+                self.best = code
+            if not self.expanded % interval:
+                self.record(self.best)
+
+            g = g_values[code] + 1
+            blank = packed.blank_index(code, self.n)
+            for target, move in neighbors[blank]:
+                child = packed.swap(code, blank, target)
+                self.generated += 1
+                if g >= g_values.get(child, g + 1):
+                    self.duplicates += 1
+                    continue
+                if child not in h_values:
+                    tile = (code >> (target << 2)) & 0xF
+                    if table is not None:
+                        h_values[child] = h + table[tile][blank] - table[tile][target]
+                    else:
+                        h_values[child] = self.heuristic.update(h, packed.unpack(child, self.n), tile, target, blank)
+                g_values[child] = g
+                self.parent[child] = (code, move)
+                if child in self.closed:
+                    self.incons.add(child)
+                else:
+                    self.push(child, weight)
+            if len(self.open) > self.peak_frontier:
+                self.peak_frontier = len(self.open)
+
+    # Suboptimality bound of the goal's current g after a round with `weight`
+    def bound(self, weight):
+        lower = min((self.g[code] + self.h[code] for code in list(self.open) + list(self.incons)), default=None)
+        goal_g = self.g[self.goal]
+        if lower is None or lower >= goal_g:
+            return 1.0
+        return min(weight, goal_g / lower)
+
+    # Starting the next round: INCONS boards rejoin OPEN, and every key is recomputed for the new weight
+    def reopen(self, weight):
+        for code in self.incons:
+            self.open[code] = None
+        self.incons = set()
+        self.closed = set()
+        codes = list(self.open)
+        self.open = {}
+        self.heap = []
+        for code in codes:
+            self.push(code, weight)
+
+    def path(self):
+        moves = []
+        code = self.goal
+        while self.parent[code] is not None:
+            code, move = self.parent[code]
+            moves.append(move)
+        moves.reverse()
+        return replay(self.initial_state, moves)
+
+
+# Weighted A*: a path at most `weight` times longer than a shortest one, found with f = g + weight * h.
+# A budget.Budget on metrics that runs out raises BudgetExceeded.
+def weighted_a_star(initial_state, goal_state, heuristic="manhattan", weight=2.0, metrics=None):
+    if metrics is None:
+        metrics = SearchMetrics()
+    validation.validate(initial_state, goal_state)
+    validation.check_packable(initial_state)
+    search = _Search(initial_state, goal_state, heuristic, metrics)
+    search.push(search.start, weight)
+    metrics.mark("search")
+    try:
+        search.improve(weight)
+    finally:
+        search.record()
+    if search.goal not in search.g:
+        return None
+    metrics.bound = search.bound(weight)
+    metrics.mark("path")
+    path = search.path()
+    metrics.cost = len(path) - 1
+    return path
+
+
+# ARA*: a first path with weight `weight`, improved with the weight lowered by `step` each round
+# (never below 1) until it is proven optimal.
+# When a budget.Budget on metrics runs out the best path so far is returned, with its bound in
+# metrics.bound. None means no path was found within the budget.
+# on_solution, if given, is called with (path, bound) for every improved path.
+def ara_star(initial_state, goal_state, heuristic="manhattan", weight=3.0, step=0.5, metrics=None,
+             on_solution=None):
+    if metrics is None:
+        metrics = SearchMetrics()
+    validation.validate(initial_state, goal_state)
+    validation.check_packable(initial_state)
+    search = _Search(initial_state, goal_state, heuristic, metrics)
+    search.push(search.start, weight)
+    best = None
+    metrics.mark("search")
+    try:
+        while True:
+            search.improve(weight)
+            if search.goal not in search.g:
+                break
+            bound = search.bound(weight)
+            if best is None or search.g[search.goal] < len(best) - 1 or bound < metrics.bound:
+                best = search.path()
+                metrics.bound = bound
+                metrics.cost = len(best) - 1
+                if on_solution is not None:
+                    on_solution(best, bound)
+            if bound <= 1.0:
+                break
+            weight = max(1.0, min(weight - step, bound))
+            search.reopen(weight)
+    except BudgetExceeded:
+        pass
+    search.record()
+    metrics.mark("path")
+    return best
@@ -0,0 +1,255 @@
+import time
+
+from puzzle_solver import relabel, validation
+from puzzle_solver.budget import Budget, BudgetExceeded
+from puzzle_solver.metrics import SearchMetrics
+
+# Headless entry point: solve(board, algorithm, heuristic) returns the path plus stats.
+# Engines are imported when first used, so importing this module only pulls in validation, metrics
+# and budget.
+
+
+class SolveResult:
+    # path : list of (state, move) pairs from the board to the goal, None if no solution was found
+    # stats : algorithm, heuristic, time in seconds, path length and the engine's metrics as a flat dict
+    # metrics : the metrics.SearchMetrics the engine filled
+    # status : "solved", "no_solution" or "budget_exceeded" (ara_star may still have a path then)
+    # best : for a search stopped by its budget, the board seen closest to the goal (lowest h of the
+    # engine's heuristic, Manhattan distance for the blind searches, in stats["best_h"]), else None
+    def __init__(self, path, stats, metrics=None, status=None, best=None):
+        self.path = path
+        self.stats = stats
+        self.metrics = metrics
+        self.status = status or ("no_solution" if path is None else "solved")
+        self.best = best
+
+    # Moves of the blank, without the starting None
+    @property
+    def moves(self):
+        return None if self.path is None else [move for state, move in self.path[1:]]
+
+    @property
+    def length(self):
+        return None if self.path is None else len(self.path) - 1
+
+    def __repr__(self):
+        return "SolveResult(status=" + self.status + ", length=" + str(self.length) + ", stats=" + str(self.stats) + ")"
+
+
+def _bfs(board, goal, heuristic, metrics, options):
+    from puzzle_solver import search
+    return search.bfs(board, goal, metrics)
+
+
+def _dfs(board, goal, heuristic, metrics, options):
+    from puzzle_solver import search
+    return search.dfs(board, goal, metrics)
+
+
+def _a_star(board, goal, heuristic, metrics, options):
+    from puzzle_solver import heuristics, search
+    if heuristic is not None:
+        heuristic = heuristics.for_goal(heuristic, goal)
+    return search.a_star(board, goal, heuristic, metrics)
+
+
+def _packed_bfs(board, goal, heuristic, metrics, options):
+    from puzzle_solver import packed
+    return packed.bfs(board, goal, metrics)
+
+
+def _packed_dfs(board, goal, heuristic, metrics, options):
+    from puzzle_solver import packed
+    return packed.dfs(board, goal, metrics)
+
+
+def _compact_bfs(board, goal, heuristic, metrics, options):
+    from puzzle_solver import packed
+    return packed.compact_bfs(board, goal, metrics)
+
+
+def _bidirectional_bfs(board, goal, heuristic, metrics, options):
+    from puzzle_solver import packed
+    return packed.bidirectional_bfs(board, goal, metrics)
+
+
+def _vectorized_bfs(board, goal, heuristic, metrics, options):
+    from puzzle_solver import vectorized
+    return vectorized.bfs(board, goal, metrics)
+
+
+def _oracle(board, goal, heuristic, metrics, options):
+    from puzzle_solver import oracle
+    return oracle.solve(board, goal, metrics=metrics)
+
+
+def _depth_limited_dfs(board, goal, heuristic, metrics, options):
+    from puzzle_solver import iddfs
+    return iddfs.depth_limited_dfs(board, goal, options.get("max_depth"), metrics)
+
+
+def _iterative_deepening_dfs(board, goal, heuristic, metrics, options):
+    from puzzle_solver import iddfs
+    return iddfs.iterative_deepening_dfs(board, goal, options.get("max_depth"), metrics)
+
+
+def _ida_star(board, goal, heuristic, metrics, options):
+    from puzzle_solver import heuristics, idastar
+    max_depth = options.get("max_depth")
+    if heuristic == "pattern_database":
+        pdb = heuristics.get("pattern_database").for_width(len(board))
+        return idastar.ida_star(board, goal, max_depth, pdb=pdb, metrics=metrics)
+    if heuristic not in (None, "manhattan"):
+        raise ValueError("ida_star supports the manhattan and pattern_database heuristics")
+    return idastar.ida_star(board, goal, max_depth, metrics=metrics)
+
+
+def _weighted_a_star(board, goal, heuristic, metrics, options):
+    from puzzle_solver import anytime, heuristics
+    return anytime.weighted_a_star(board, goal, heuristics.for_goal(heuristic or "manhattan", goal),
+                                   options.get("weight") or 2.0, metrics=metrics)
+
+
+def _ara_star(board, goal, heuristic, metrics, options):
+    from puzzle_solver import anytime, heuristics
+    return anytime.ara_star(board, goal, heuristics.for_goal(heuristic or "manhattan", goal),
+                            options.get("weight") or 3.0, metrics=metrics)
+
+
+# Algorithm name --> engine(board, goal, heuristic, metrics, options), options holding the keyword
+# arguments of solve() that only some engines use (max_depth, weight)
+ALGORITHMS = {
+    "bfs": _bfs,
+    "dfs": _dfs,
+    "astar": _a_star,
+    "packed_bfs": _packed_bfs,
+    "packed_dfs": _packed_dfs,
+    "compact_bfs": _compact_bfs,
+    "bidirectional_bfs": _bidirectional_bfs,
+    "vectorized_bfs": _vectorized_bfs,
+    "depth_limited_dfs": _depth_limited_dfs,
+    "iterative_deepening_dfs": _iterative_deepening_dfs,
+    "oracle": _oracle,
+    "ida_star": _ida_star,
+    "weighted_astar": _weighted_a_star,
+    "ara_star": _ara_star,
+}
+
+
+# Engines whose paths are always shortest ones; only these read and feed a solution cache
+OPTIMAL_ALGORITHMS = {"bfs", "astar", "packed_bfs", "compact_bfs", "bidirectional_bfs", "vectorized_bfs",
+                      "iterative_deepening_dfs", "oracle", "ida_star"}
+
+
+# Engines working on packed boards (see packed.py), which only take boards up to 4x4
+PACKED_ALGORITHMS = {"packed_bfs", "packed_dfs", "compact_bfs", "bidirectional_bfs", "vectorized_bfs",
+                     "depth_limited_dfs", "iterative_deepening_dfs", "weighted_astar", "ara_star"}
+
+
+# Loading the tables that `algorithm` with `heuristic` reads on n x n boards, building them first
+# if they are not on disk yet. batch.run calls it in the parent process before its workers need
+# them, so they only map finished tables instead of each building its own copy.
+def prepare(algorithm, heuristic, n):
+    if algorithm == "oracle" and n == 3:
+        from puzzle_solver import oracle
+        oracle.load_table()
+    elif heuristic == "pattern_database" and algorithm in ("astar", "ida_star", "weighted_astar", "ara_star"):
+        from puzzle_solver import heuristics, pdb
+        if n in pdb.PARTITIONS:
+            heuristics.get("pattern_database").for_width(n).tables
+
+
+# Goal with tile t in cell t and the blank first, as used by the GUIs
+def default_goal(n=3):
+    return [list(range(i * n, (i + 1) * n)) for i in range(n)]
+
+
+# Validating the board, then solving it with the chosen engine.
+# Raises validation.InvalidBoardError (or its UnsolvableBoardError subclass) for bad input.
+# metrics is an optional metrics.SearchMetrics, e.g. with a callback or tracemalloc enabled; one is
+# created otherwise. progress is an optional progress.Progress to watch or cancel the search from
+# another thread; a cancelled search raises progress.SearchCancelled.
+# max_depth bounds the depth-limited engines (depth_limited_dfs, iterative_deepening_dfs, ida_star).
+# weight is the heuristic weight of weighted_astar (default 2) and the starting weight of ara_star
+# (default 3). Both report the proven suboptimality bound as stats["bound"].
+# deadline (seconds), max_expansions, max_nodes (boards held at once) and max_bytes (allocated, which
+# turns tracemalloc on) bound any engine through a budget.Budget. A search that runs out returns a
+# result with status "budget_exceeded", no path, the reason in stats["budget_exceeded"] and the board
+# seen closest to the goal as result.best; ara_star keeps its best path so far.
+# cache is an optional cache.SolutionCache: optimal engines answer from it when they can, with
+# stats["cache_hit"] set, and store every path they find.
+# Any goal works. When its blank is in a corner the board is relabeled onto the standard goal
+# (see relabel.py), so every engine, table and cache works on it; otherwise the searches fall
+# back to goal-aware Manhattan or Euclidean tables, and the oracle and pattern databases refuse it.
+def solve(board, algorithm="astar", heuristic="manhattan", goal=None, progress=None, metrics=None, max_depth=None,
+          cache=None, weight=None, deadline=None, max_expansions=None, max_nodes=None, max_bytes=None):
+    if algorithm not in ALGORITHMS:
+        raise ValueError("Unknown algorithm " + repr(algorithm) + ", expected one of " + ", ".join(ALGORITHMS))
+    if metrics is None:
+        metrics = SearchMetrics()
+    if progress is not None:
+        metrics.add_callback(progress)
+    if goal is None:
+        goal = default_goal(len(board) if isinstance(board, (list, tuple)) and board else 3)
+    metrics.mark("validate")
+    validation.validate(board, goal)
+    if algorithm in PACKED_ALGORITHMS:
+        validation.check_packable(board)
+    board = validation.normalize(board)
+    goal = validation.normalize(goal)
+
+    start = time.perf_counter()
+    standard_goal = default_goal(len(board))
+    transform = None
+    if goal != standard_goal:
+        transform = relabel.relabeling(goal)
+        if transform is not None:
+            board = relabel.apply(board, transform)
+            goal = standard_goal
+    # The cache is keyed by packed boards, so wider boards are solved without it
+    if cache is None or algorithm not in OPTIMAL_ALGORITHMS or len(board) > validation.PACKED_WIDTH:
+        cache = None
+    else:
+        metrics.mark("cache")
+        moves = cache.get(board, goal)
+        if moves is not None:
+            metrics.finish()
+            # A cached path is a shortest one, so a longer one means none fits within max_depth
+            from puzzle_solver.idastar import replay
+            path = None if max_depth is not None and len(moves) > max_depth else replay(board, moves)
+            return _result(algorithm, heuristic, path, metrics, start, True, transform)
+
+    budget = None
+    if (deadline, max_expansions, max_nodes, max_bytes) != (None, None, None, None):
+        budget = Budget(max_expansions, max_nodes, deadline, max_bytes, goal)
+        budget.attach(metrics)
+    metrics.start()
+    metrics.mark("setup")
+    try:
+        options = {"max_depth": max_depth, "weight": weight}
+        path = ALGORITHMS[algorithm](board, goal, heuristic, metrics, options)
+    except BudgetExceeded:
+        path = None
+    finally:
+        metrics.finish()
+    if cache is not None and path is not None:
+        cache.put(board, goal, [move for state, move in path[1:]])
+    return _result(algorithm, heuristic, path, metrics, start, False, transform, budget)
+
+
+def _result(algorithm, heuristic, path, metrics, start, cache_hit, transform, budget=None):
+    exceeded = budget is not None and budget.reason is not None
+    best = budget.best if exceeded else None
+    if transform is not None:
+        path = relabel.restore_path(path, transform)
+        if best is not None:
+            best = relabel.restore(best, transform)
+    stats = {"algorithm": algorithm, "heuristic": heuristic}
+    stats.update(metrics.as_dict())
+    stats["time"] = time.perf_counter() - start
+    stats["path_length"] = None if path is None else len(path) - 1
+    stats["cache_hit"] = cache_hit
+    if exceeded:
+        stats["budget_exceeded"] = budget.reason
+        stats["best_h"] = budget.best_h
+    return SolveResult(path, stats, metrics, "budget_exceeded" if exceeded else None, best)
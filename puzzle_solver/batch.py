@@ -0,0 +1,222 @@
+import argparse
+import json
+import math
+import multiprocessing
+import sys
+import threading
+
+from puzzle_solver import api, cache as solution_cache
+
+# Batch mode: boards are streamed from a file or stdin, solved by a pool of worker processes and
+# written as JSONL in the order they finish.
+# Only a bounded number of boards is ever in flight (read but not yet written), so memory stays flat
+# however long the input is.
+#
+#   python -m puzzle_solver.batch boards.txt -a ida_star -H pattern_database -o results.jsonl
+#
+# One board per line, either JSON ([[1, 2, 5], [3, 4, 0], [6, 7, 8]], a flat list, or
+# {"id": ..., "board": ...}) or plain tiles separated by spaces or commas (1 2 5 3 4 0 6 7 8).
+# Blank lines and lines starting with # are skipped.
+#
+# --deadline, --max-expansions and --max-nodes bound the search of every board (see budget.py): a
+# board that runs out is written with "status": "budget_exceeded", the reason and the closest board
+# found, and the run moves on.
+#
+# Tables the engine reads (the oracle's, pattern databases) are built by the parent process the
+# first time a board of a new width comes up, before that board reaches a worker.
+#
+# With --cache FILE, optimal engines share a cache.SolutionCache kept in FILE across runs: boards on
+# an already solved path are answered by the parent process without reaching a worker, and every
+# new path is added to it.
+
+
+# Parsing one input line into (id, list-of-lists board); the id defaults to the line number
+def parse_line(line, number):
+    text = line.strip()
+    board_id = number
+    if text[0] in "[{":
+        board = json.loads(text)
+        if isinstance(board, dict):
+            board_id = board.get("id", number)
+            board = board.get("board")
+    else:
+        board = [int(tile) for tile in text.replace(",", " ").split()]
+
+    # A flat list of n*n tiles is cut into rows
+    if isinstance(board, list) and board and all(isinstance(tile, int) for tile in board):
+        n = math.isqrt(len(board))
+        if n * n != len(board):
+            raise ValueError("A flat board needs a square number of tiles, got " + str(len(board)))
+        board = [board[i * n:(i + 1) * n] for i in range(n)]
+    return board_id, board
+
+
+# Worker side: solving one board and turning the result into a JSON-ready record
+# limits holds the budget keyword arguments of api.solve
+def solve_job(job):
+    number, line, algorithm, heuristic, max_depth, limits = job
+    record = {"id": number}
+    try:
+        record["id"], board = parse_line(line, number)
+        record["board"] = board
+        result = api.solve(board, algorithm, heuristic, max_depth=max_depth, **limits)
+    except ValueError as error:
+        record["error"] = str(error)
+        return record
+    except Exception as error:
+        # Any other failure is still written with the board's id, and the run goes on
+        record["error"] = repr(error)
+        return record
+    return _fill_record(record, result)
+
+
+def _fill_record(record, result):
+    record["status"] = result.status
+    if result.status == "budget_exceeded":
+        record["reason"] = result.stats["budget_exceeded"]
+        record["best"] = result.best
+        record["best_h"] = result.stats["best_h"]
+    record["length"] = result.length
+    record["moves"] = result.moves
+    record["nodes_expanded"] = result.metrics.expansions
+    record["time"] = result.stats["time"]
+    record["cache_hit"] = result.stats["cache_hit"]
+    record["metrics"] = result.metrics.as_dict()
+    return record
+
+
+# Solving the standard goal with the chosen engine, so that one that cannot run here (NumPy missing
+# for vectorized_bfs, an unknown heuristic) fails the run once instead of every board.
+# Raises ImportError or ValueError.
+def check(algorithm, heuristic):
+    if algorithm not in api.ALGORITHMS:
+        raise ValueError("Unknown algorithm " + repr(algorithm) + ", expected one of " + ", ".join(api.ALGORITHMS))
+    api.solve(api.default_goal(3), algorithm, heuristic)
+
+
+# Reading boards from `source`, solving them on `processes` workers and writing one JSON line per
+# board to `output` as soon as it is solved. At most `max_pending` boards are queued at a time.
+# cache is an optional cache.SolutionCache, consulted before a board is sent to a worker.
+# limits optionally holds budget keyword arguments of api.solve (deadline, max_expansions, max_nodes).
+# Returns (boards solved, boards that failed); boards that ran out of budget count as solved.
+# Raises ImportError or ValueError, before reading any board, if the engine cannot run (see check).
+def run(source, output, algorithm="astar", heuristic="manhattan", processes=None, max_pending=None, max_depth=None,
+        cache=None, limits=None):
+    check(algorithm, heuristic)
+    if algorithm not in api.OPTIMAL_ALGORITHMS:
+        cache = None
+    processes = processes or multiprocessing.cpu_count()
+    limits = limits or {}
+    slots = threading.BoundedSemaphore(max_pending or processes * 4)
+    counts = [0, 0]
+    # Cache hits are written from the reading thread, results from the pool's result thread
+    lock = threading.Lock()
+
+    def write(record):
+        with lock:
+            if cache is not None and record.get("moves") is not None and not record["cache_hit"]:
+                cache.put(record["board"], api.default_goal(len(record["board"])),
+                          [tuple(move) for move in record["moves"]])
+            output.write(json.dumps(record) + "\n")
+            output.flush()
+            counts["error" in record] += 1
+        slots.release()
+
+    def fail(error):
+        write({"error": repr(error)})
+
+    # The pool starts with the first board that needs it, once that board's tables exist
+    pool = None
+    widths = set()
+    try:
+        for number, line in enumerate(source, 1):
+            if not line.strip() or line.lstrip().startswith("#"):
+                continue
+            slots.acquire()
+            if cache is not None:
+                with lock:
+                    result = _cached(number, line, algorithm, heuristic, max_depth, cache)
+                if result is not None:
+                    write(result)
+                    continue
+            width = _width(line, number)
+            if width not in widths:
+                widths.add(width)
+                api.prepare(algorithm, heuristic, width)
+            if pool is None:
+                pool = multiprocessing.Pool(processes)
+            pool.apply_async(solve_job, ((number, line, algorithm, heuristic, max_depth, limits),), callback=write,
+                             error_callback=fail)
+        if pool is not None:
+            pool.close()
+            pool.join()
+    finally:
+        if pool is not None:
+            pool.terminate()
+    return counts[0], counts[1]
+
+
+# Width of the board on a line, or None for lines the worker should report on
+def _width(line, number):
+    try:
+        board = parse_line(line, number)[1]
+    except (ValueError, TypeError):
+        return None
+    return len(board) if isinstance(board, list) else None
+
+
+# Record for a board the cache already holds, or None (also for lines the worker should report on)
+def _cached(number, line, algorithm, heuristic, max_depth, cache):
+    try:
+        board_id, board = parse_line(line, number)
+        if not cache.contains(board, api.default_goal(len(board))):
+            return None
+        result = api.solve(board, algorithm, heuristic, max_depth=max_depth, cache=cache)
+    except (ValueError, TypeError):
+        return None
+    return _fill_record({"id": board_id, "board": board}, result)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m puzzle_solver.batch",
+                                     description="Solve many boards in parallel and write the results as JSONL.")
+    parser.add_argument("input", nargs="?", default="-", help="file with one board per line (default: stdin)")
+    parser.add_argument("-o", "--output", default="-", help="JSONL file to write (default: stdout)")
+    parser.add_argument("-a", "--algorithm", default="astar", choices=list(api.ALGORITHMS))
+    parser.add_argument("-H", "--heuristic", default="manhattan")
+    parser.add_argument("-d", "--max-depth", type=int, default=None,
+                        help="depth limit for depth_limited_dfs, iterative_deepening_dfs and ida_star")
+    parser.add_argument("-j", "--processes", type=int, default=None, help="worker processes (default: CPU count)")
+    parser.add_argument("--max-pending", type=int, default=None,
+                        help="boards queued at once (default: 4 per worker)")
+    parser.add_argument("--cache", default=None,
+                        help="JSON file of known optimal paths, read before and updated after the run")
+    parser.add_argument("--deadline", type=float, default=None, help="seconds allowed per board")
+    parser.add_argument("--max-expansions", type=int, default=None, help="expansions allowed per board")
+    parser.add_argument("--max-nodes", type=int, default=None, help="boards held in memory at once per board")
+    args = parser.parse_args(argv)
+    try:
+        check(args.algorithm, args.heuristic)
+    except (ImportError, ValueError) as error:
+        parser.error(str(error))
+    cache = None if args.cache is None else solution_cache.SolutionCache(path=args.cache)
+    limits = {"deadline": args.deadline, "max_expansions": args.max_expansions, "max_nodes": args.max_nodes}
+
+    source = sys.stdin if args.input == "-" else open(args.input)
+    output = sys.stdout if args.output == "-" else open(args.output, "w")
+    try:
+        solved, failed = run(source, output, args.algorithm, args.heuristic, args.processes, args.max_pending,
+                             args.max_depth, cache, limits)
+    finally:
+        if cache is not None:
+            cache.save()
+        if source is not sys.stdin:
+            source.close()
+        if output is not sys.stdout:
+            output.close()
+    print(str(solved) + " boards solved, " + str(failed) + " failed", file=sys.stderr)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
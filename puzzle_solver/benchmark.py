@@ -0,0 +1,202 @@
+import argparse
+import csv
+import json
+import os
+import random
+import sys
+
+from puzzle_solver import api, heuristics, metrics, oracle, ranking, vectorized
+
+# Reproducible benchmark of every engine and heuristic on the 3x3 board.
+# Instances are drawn with a fixed seed from the oracle's distance table, a few per optimal depth,
+# so every depth from 1 to 31 is covered whatever the seed. Each run records wall time, expansions,
+# peak nodes in memory (and optionally tracemalloc bytes) and the path length.
+#
+#   python -m puzzle_solver.benchmark --per-depth 3 --csv runs.csv --json summary.json
+#   python -m puzzle_solver.benchmark --json new.json --baseline summary.json
+#
+# Every run is compared against the stored baseline (benchmark_baseline.json next to this module,
+# refreshed with --save-baseline) or the JSON output of an earlier run given as --baseline, when it
+# was made with the same instance settings. Configurations that got slower by more than the
+# tolerance, or expand more nodes, are reported and the exit code is 1. Times depend on the
+# machine, so refresh the baseline before comparing on a new one; expansions do not.
+
+MAX_DEPTH = 31
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "benchmark_baseline.json")
+FIELDS = ["algorithm", "heuristic", "depth", "board", "time", "expansions", "max_nodes_in_memory", "peak_bytes",
+          "length", "optimal"]
+
+
+# Every (algorithm, heuristic) pair worth timing: the uninformed engines once, A* with each heuristic.
+# vectorized_bfs is only timed when NumPy is installed.
+def configurations():
+    result = [("bfs", None), ("dfs", None), ("packed_bfs", None), ("packed_dfs", None), ("compact_bfs", None),
+              ("bidirectional_bfs", None), ("oracle", None)]
+    if vectorized.available():
+        result.append(("vectorized_bfs", None))
+    result += [("astar", name) for name in heuristics.names()]
+    result += [("ida_star", "manhattan"), ("ida_star", "pattern_database")]
+    result += [("weighted_astar", "manhattan"), ("ara_star", "manhattan")]
+    return result
+
+
+def configuration_name(algorithm, heuristic):
+    return algorithm if heuristic is None else algorithm + ":" + heuristic
+
+
+# Up to `per_depth` boards of each optimal depth in `depths`, as (depth, board) pairs
+def instances(per_depth=2, depths=range(1, MAX_DEPTH + 1), seed=0):
+    table = oracle.load_table()
+    by_depth = {depth: [] for depth in depths}
+    for index, depth in enumerate(table[:]):
+        if depth in by_depth:
+            by_depth[depth].append(index)
+
+    rng = random.Random(seed)
+    result = []
+    for depth in depths:
+        ranks = by_depth[depth]
+        for index in sorted(rng.sample(ranks, min(per_depth, len(ranks)))):
+            cells = ranking.unrank(index)
+            result.append((depth, [cells[i * 3:(i + 1) * 3] for i in range(3)]))
+    return result
+
+
+# Running every configuration on every instance; time is the best of `repeat` runs
+def run(boards, configs, repeat=1, trace_memory=False, log=None):
+    rows = []
+    for algorithm, heuristic in configs:
+        for depth, board in boards:
+            best = None
+            for _ in range(repeat):
+                result = api.solve(board, algorithm, heuristic,
+                                   metrics=metrics.SearchMetrics(trace_memory=trace_memory))
+                if best is None or result.stats["time"] < best.stats["time"]:
+                    best = result
+            rows.append({
+                "algorithm": algorithm,
+                "heuristic": heuristic,
+                "depth": depth,
+                "board": board,
+                "time": best.stats["time"],
+                "expansions": best.metrics.expansions,
+                "max_nodes_in_memory": best.metrics.peak_nodes,
+                "peak_bytes": best.metrics.peak_bytes,
+                "length": best.length,
+                "optimal": best.length == depth,
+            })
+        if log is not None:
+            print(configuration_name(algorithm, heuristic) + " done", file=log, flush=True)
+    return rows
+
+
+# Totals per configuration, plus per-depth means of time and expansions
+def summarize(rows):
+    summary = {}
+    for row in rows:
+        name = configuration_name(row["algorithm"], row["heuristic"])
+        entry = summary.setdefault(name, {"runs": 0, "time": 0.0, "expansions": 0, "max_nodes_in_memory": 0,
+                                          "non_optimal": 0, "depths": {}})
+        entry["runs"] += 1
+        entry["time"] += row["time"]
+        entry["expansions"] += row["expansions"]
+        entry["max_nodes_in_memory"] = max(entry["max_nodes_in_memory"], row["max_nodes_in_memory"])
+        entry["non_optimal"] += not row["optimal"]
+        depth = entry["depths"].setdefault(str(row["depth"]), {"runs": 0, "time": 0.0, "expansions": 0})
+        depth["runs"] += 1
+        depth["time"] += row["time"]
+        depth["expansions"] += row["expansions"]
+    for entry in summary.values():
+        for depth in entry["depths"].values():
+            depth["time"] /= depth["runs"]
+            depth["expansions"] /= depth["runs"]
+    return summary
+
+
+# Configurations whose total time or expansions grew by more than `tolerance` (0.1 = 10%) against
+# the baseline summary, as (configuration, metric, baseline value, new value) tuples.
+# Expansions are deterministic, so any growth there is reported.
+def compare(summary, baseline, tolerance=0.1):
+    regressions = []
+    for name, entry in summary.items():
+        old = baseline.get(name)
+        if old is None or old["runs"] != entry["runs"]:
+            continue
+        if entry["time"] > old["time"] * (1 + tolerance):
+            regressions.append((name, "time", old["time"], entry["time"]))
+        if entry["expansions"] > old["expansions"]:
+            regressions.append((name, "expansions", old["expansions"], entry["expansions"]))
+    return regressions
+
+
+def write_csv(rows, path):
+    with open(path, "w", newline="") as file:
+        writer = csv.DictWriter(file, FIELDS)
+        writer.writeheader()
+        for row in rows:
+            writer.writerow(dict(row, board="".join(str(tile) for line in row["board"] for tile in line)))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m puzzle_solver.benchmark",
+                                     description="Benchmark every engine on seeded 3x3 boards of depth 1 to 31.")
+    parser.add_argument("--per-depth", type=int, default=2, help="boards per optimal depth (default: 2)")
+    parser.add_argument("--min-depth", type=int, default=1)
+    parser.add_argument("--max-depth", type=int, default=MAX_DEPTH)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=1, help="runs per board, the fastest is kept")
+    parser.add_argument("--only", nargs="*", default=None,
+                        help="configurations to run, e.g. bfs astar:manhattan (default: all)")
+    parser.add_argument("--trace-memory", action="store_true", help="also record tracemalloc peak bytes")
+    parser.add_argument("--csv", default=None, help="write one row per run to this file")
+    parser.add_argument("--json", default=None, help="write the settings, summary and runs to this file")
+    parser.add_argument("--baseline", default=None,
+                        help="JSON file of an earlier run to compare against (default: the stored baseline)")
+    parser.add_argument("--save-baseline", action="store_true", help="store this run as the new baseline")
+    parser.add_argument("--tolerance", type=float, default=0.1, help="allowed slowdown against the baseline")
+    args = parser.parse_args(argv)
+
+    configs = configurations()
+    if args.only:
+        configs = [config for config in configs if configuration_name(*config) in args.only]
+    boards = instances(args.per_depth, range(args.min_depth, args.max_depth + 1), args.seed)
+    rows = run(boards, configs, args.repeat, args.trace_memory, log=sys.stderr)
+    summary = summarize(rows)
+
+    for name, entry in summary.items():
+        print(name.ljust(32) + " runs " + str(entry["runs"]).rjust(4) + "   time " +
+              format(entry["time"], ".3f").rjust(9) + " s   expansions " + str(entry["expansions"]).rjust(10) +
+              "   non-optimal " + str(entry["non_optimal"]))
+
+    settings = {"per_depth": args.per_depth, "min_depth": args.min_depth, "max_depth": args.max_depth,
+                "seed": args.seed}
+    if args.csv:
+        write_csv(rows, args.csv)
+    if args.json:
+        with open(args.json, "w") as file:
+            json.dump({"settings": settings, "summary": summary, "runs": rows}, file, indent=1)
+    if args.save_baseline:
+        with open(DEFAULT_BASELINE, "w") as file:
+            json.dump({"settings": settings, "summary": summary}, file, indent=1)
+        print("Baseline written to " + DEFAULT_BASELINE)
+        return 0
+
+    baseline_path = args.baseline or (DEFAULT_BASELINE if os.path.exists(DEFAULT_BASELINE) else None)
+    if baseline_path:
+        with open(baseline_path) as file:
+            baseline = json.load(file)
+        # Only the same instance set can be compared
+        if baseline["settings"] != settings:
+            print("Baseline " + baseline_path + " was run with " + str(baseline["settings"]) + ", not compared")
+            return 0
+        regressions = compare(summary, baseline["summary"], args.tolerance)
+        for name, metric, old, new in regressions:
+            print("REGRESSION " + name + " " + metric + ": " + str(old) + " -> " + str(new))
+        if regressions:
+            return 1
+        print("No regressions against " + baseline_path)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
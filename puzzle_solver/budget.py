@@ -0,0 +1,97 @@
+import time
+import tracemalloc
+
+from puzzle_solver import heuristics
+
+# Limits on one search run: boards expanded, boards held in memory, bytes allocated and wall time.
+# A Budget is registered as a metrics.SearchMetrics callback, like progress.Progress, so the limits
+# are only looked at when the engine records its counters and cost nothing in the hot loop itself;
+# attach() lowers the metrics interval so that happens at least every `interval` expansions, and
+# splits max_expansions into equal steps so the search stops on it or at most 0.4% past it.
+# When a limit is hit the callback raises BudgetExceeded on the search thread, and api.solve turns
+# it into a result with status "budget_exceeded" instead of a path.
+# The budget also keeps the best board found so far. Engines that compute h for every board (A*,
+# IDA*, weighted A*, ARA* and Astar.py's Puzzle.solve) track the expanded board of lowest h
+# themselves and pass it to record() with its h, so the best board is exact and measured with their
+# own heuristic. The blind searches pass the board they are expanding, and the budget samples it
+# at every check by Manhattan distance.
+
+
+class BudgetExceeded(Exception):
+    pass
+
+
+class Budget:
+    # Largest number of expansions between two checks once attached
+    interval = 256
+
+    # max_expansions : boards expanded
+    # max_nodes : boards held at once (frontier + visited), the cheap measure of memory
+    # max_bytes : bytes allocated, measured with tracemalloc (which slows the search down)
+    # deadline : seconds from start()
+    # goal_state : goal the best board is measured against, the standard one if None
+    def __init__(self, max_expansions=None, max_nodes=None, deadline=None, max_bytes=None, goal_state=None):
+        self.max_expansions = max_expansions
+        self.max_nodes = max_nodes
+        self.deadline = deadline
+        self.max_bytes = max_bytes
+        self.goal_state = goal_state
+        self.start()
+
+    # Starting the clock and forgetting the previous run
+    def start(self):
+        self.stop_time = None if self.deadline is None else time.perf_counter() + self.deadline
+        self.reason = None
+        self.best = None
+        self.best_h = None
+        self._heuristic = None
+
+    # Registering on `metrics` before the search starts
+    def attach(self, metrics):
+        if self.max_bytes is not None:
+            metrics.trace_memory = True
+        interval = self.interval
+        if self.max_expansions is not None:
+            # The fewest checks of at most `interval` expansions each that reach the limit; the
+            # last one overshoots by less than their number
+            checks = max(1, -(-self.max_expansions // interval))
+            interval = -(-self.max_expansions // checks)
+        metrics.interval = min(metrics.interval, interval)
+        metrics.add_callback(self)
+        self.start()
+
+    def _distance(self, state):
+        if self._heuristic is None:
+            goal = self.goal_state
+            if goal is None:
+                n = len(state)
+                goal = [list(range(i * n, (i + 1) * n)) for i in range(n)]
+            self._heuristic = heuristics.for_goal("manhattan", goal)
+        return self._heuristic.evaluate(state)
+
+    # Called through SearchMetrics.record. Only records that carry the board being expanded are
+    # checked: the others end the search, which has found its path by then or is unwinding after a
+    # limit was hit.
+    def __call__(self, metrics):
+        if metrics.current is None or self.reason is not None:
+            return
+        h = metrics.current_h
+        if h is None:
+            h = self._distance(metrics.current)
+        if self.best_h is None or h < self.best_h:
+            self.best = [list(row) for row in metrics.current]
+            self.best_h = h
+
+        if self.max_expansions is not None and metrics.expansions >= self.max_expansions:
+            self.reason = "Expansion budget of " + str(self.max_expansions) + " used up"
+        elif self.max_nodes is not None and metrics.frontier + metrics.visited > self.max_nodes:
+            self.reason = ("Node budget of " + str(self.max_nodes) + " exceeded with " +
+                           str(metrics.frontier + metrics.visited) + " boards held")
+        elif (self.max_bytes is not None and tracemalloc.is_tracing() and
+              tracemalloc.get_traced_memory()[0] > self.max_bytes):
+            self.reason = "Memory budget of " + str(self.max_bytes) + " bytes exceeded"
+        elif self.stop_time is not None and time.perf_counter() >= self.stop_time:
+            self.reason = ("Deadline of " + str(self.deadline) + " s reached after " + str(metrics.expansions) +
+                           " expansions")
+        if self.reason is not None:
+            raise BudgetExceeded(self.reason)
@@ -0,0 +1,123 @@
+import json
+import os
+from collections import OrderedDict
+
+from puzzle_solver import packed, symmetry, validation
+
+# Cache of optimal solutions keyed by the packed board and goal, with LRU eviction.
+# A solved path also gives an optimal path for every state along it, so all of its suffixes are
+# stored. The moves of one path are kept once as bytes (one MOVE_INDEX per move) and every state
+# on it maps to (moves, offset, mirrored), which costs one small entry per state and stays valid
+# whichever entries get evicted. Only optimal engines should feed it: suffixes of a non-optimal path are
+# not optimal.
+# For goals that mirroring keeps in place (the standard one among them), a board and its mirror
+# share one entry through symmetry.canonical, and the moves are transposed back on the way out.
+
+
+class SolutionCache:
+    _goal_mask = (1 << 64) - 1
+
+    # capacity : number of states kept before the least recently used ones are evicted
+    # path : optional JSON file loaded now (if it exists) and written by save()
+    def __init__(self, capacity=100000, path=None):
+        self.capacity = capacity
+        self.path = path
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        # Board width per packed goal, needed to unpack the saved paths
+        self._sizes = {}
+        # Whether each packed goal lets boards share a key with their mirror
+        self._symmetric = {}
+        if path is not None and os.path.exists(path):
+            self.load(path)
+
+    def __len__(self):
+        return len(self._entries)
+
+    @staticmethod
+    def key(code, goal_code):
+        return code << 64 | goal_code
+
+    # (key, mirrored) for a packed board: the board and its mirror get the same key when the goal allows it
+    def _lookup_key(self, code, goal_code, n):
+        symmetric = self._symmetric.get(goal_code)
+        if symmetric is None:
+            symmetric = self._symmetric[goal_code] = symmetry.is_symmetric(goal_code, n)
+        if symmetric:
+            code, mirrored = symmetry.canonical(code, n)
+            return self.key(code, goal_code), mirrored
+        return self.key(code, goal_code), False
+
+    # Whether a path from `state` is cached, without counting a hit or refreshing it
+    def contains(self, state, goal_state):
+        validation.check_packable(state)
+        return self._lookup_key(packed.pack(state), packed.pack(goal_state), len(state))[0] in self._entries
+
+    # Moves of a cached optimal path from `state` to `goal_state`, or None
+    def get(self, state, goal_state):
+        validation.check_packable(state)
+        key, mirrored = self._lookup_key(packed.pack(state), packed.pack(goal_state), len(state))
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        moves, offset, stored_mirrored = entry
+        return symmetry.restore_moves([packed.MOVES[index] for index in moves[offset:]], mirrored != stored_mirrored)
+
+    # Storing an optimal path (as its moves) and every suffix of it
+    def put(self, state, goal_state, moves):
+        validation.check_packable(state)
+        n = len(state)
+        self._put_codes(packed.pack(state), packed.pack(goal_state), n,
+                        bytes(packed.MOVE_INDEX[move] for move in moves))
+
+    def _put_codes(self, code, goal_code, n, moves):
+        entries = self._entries
+        self._sizes[goal_code] = n
+        blank = packed.blank_index(code, n)
+        for offset in range(len(moves) + 1):
+            key, mirrored = self._lookup_key(code, goal_code, n)
+            if key in entries:
+                entries.move_to_end(key)
+            entries[key] = (moves, offset, mirrored)
+            if offset < len(moves):
+                move = packed.MOVES[moves[offset]]
+                target = blank + move[0] * n + move[1]
+                code = packed.swap(code, blank, target)
+                blank = target
+        while len(entries) > self.capacity:
+            entries.popitem(last=False)
+
+    def clear(self):
+        self._entries.clear()
+
+    # Writing the cache as JSON: for every stored path, its longest suffix still cached.
+    # Paths come out least recently used first, so loading them back keeps roughly the same order.
+    def save(self, path=None):
+        path = path or self.path
+        longest = {}
+        for key, (moves, offset, mirrored) in self._entries.items():
+            known = longest.get(id(moves))
+            if known is None or offset < known[2]:
+                longest[id(moves)] = (key, moves, offset, mirrored)
+        records = []
+        for key, moves, offset, mirrored in longest.values():
+            goal_code = key & self._goal_mask
+            n = self._sizes[goal_code]
+            # The moves belong to the board that was stored, which may be the mirror of the key
+            code = symmetry.mirror_code(key >> 64, n) if mirrored else key >> 64
+            records.append([n, code, goal_code, moves[offset:].hex()])
+        temp_path = path + ".tmp"
+        with open(temp_path, "w") as file:
+            json.dump({"capacity": self.capacity, "paths": records}, file)
+        os.replace(temp_path, path)
+        return path
+
+    def load(self, path):
+        with open(path) as file:
+            records = json.load(file)["paths"]
+        for n, code, goal_code, moves in records:
+            self._put_codes(code, goal_code, n, bytes.fromhex(moves))
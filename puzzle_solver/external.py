@@ -0,0 +1,214 @@
+import argparse
+import heapq
+import json
+import mmap
+import os
+import sys
+import time
+from array import array
+
+from puzzle_solver import packed
+from puzzle_solver.metrics import SearchMetrics
+
+# External-memory (disk-backed) BFS, for state spaces that do not fit in RAM.
+# Every BFS layer is a file of sorted, distinct packed boards (8 bytes each, native byte order).
+# To build layer d + 1, layer d is streamed from disk. Its children are collected in a buffer of
+# `chunk_size` boards, and each full buffer is sorted and written out as a run file. The runs are
+# then merged through memory-mapped reads. The merge drops repeats and the boards of layer d - 1,
+# the only earlier layer a child can be in since the state graph is bipartite (see vectorized.py).
+# Memory stays bounded by the chunk size and one read window per run, whatever the layer size.
+#
+# manifest.json in the working directory is rewritten atomically after every layer. An interrupted
+# run resumes from the last finished layer with the same command, and half-written files are
+# discarded.
+#
+#   python -m puzzle_solver.external work_4x4 -n 4 --chunk-size 50000000 --drop-layers
+#
+# The result is the distance histogram (boards per depth). With all layer files kept, the
+# directory also holds every board's distance from the start, which is what a pattern database
+# or an exact-distance table is built from.
+
+MANIFEST = "manifest.json"
+# Boards read per slice of a memory-mapped file
+_READ_SLICE = 1 << 16
+
+
+def layer_path(directory, depth):
+    return os.path.join(directory, "layer_" + str(depth).zfill(3) + ".bin")
+
+
+# Boards of a sorted layer or run file, read through a memory map
+def read_codes(path):
+    if not os.path.getsize(path):
+        return
+    with open(path, "rb") as file:
+        data = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+    view = memoryview(data).cast("Q")
+    try:
+        for start in range(0, len(view), _READ_SLICE):
+            yield from view[start:start + _READ_SLICE].tolist()
+    finally:
+        view.release()
+        data.close()
+
+
+def _write_atomic(path, codes):
+    temp_path = path + ".tmp"
+    with open(temp_path, "wb") as file:
+        codes.tofile(file)
+    os.replace(temp_path, path)
+
+
+# Sorting one buffer of children and writing it as a run of distinct boards
+def _write_run(directory, number, buffer):
+    path = os.path.join(directory, "run_" + str(number).zfill(5) + ".bin")
+    _write_atomic(path, array("Q", sorted(set(buffer))))
+    return path
+
+
+# Writing layer `depth` + 1 from layer `depth`; returns (layer size, boards expanded, children generated)
+def _next_layer(directory, depth, n, chunk_size):
+    neighbors = packed.neighbor_table(n)
+    runs = []
+    buffer = []
+    expanded = generated = 0
+    for code in read_codes(layer_path(directory, depth)):
+        blank = packed.blank_index(code, n)
+        for target, move in neighbors[blank]:
+            buffer.append(packed.swap(code, blank, target))
+        expanded += 1
+        if len(buffer) >= chunk_size:
+            generated += len(buffer)
+            runs.append(_write_run(directory, len(runs), buffer))
+            buffer = []
+    generated += len(buffer)
+    if buffer:
+        runs.append(_write_run(directory, len(runs), buffer))
+
+    previous = read_codes(layer_path(directory, depth - 1) if depth else os.devnull)
+    older = next(previous, None)
+    output = array("Q")
+    size = 0
+    last = None
+    temp_path = layer_path(directory, depth + 1) + ".tmp"
+    with open(temp_path, "wb") as file:
+        for code in heapq.merge(*[read_codes(run) for run in runs]):
+            if code == last:
+                continue
+            last = code
+            while older is not None and older < code:
+                older = next(previous, None)
+            if older == code:
+                continue
+            output.append(code)
+            if len(output) >= chunk_size:
+                output.tofile(file)
+                size += len(output)
+                del output[:]
+        output.tofile(file)
+        size += len(output)
+    previous.close()
+    os.replace(temp_path, layer_path(directory, depth + 1))
+    for run in runs:
+        os.remove(run)
+    return size, expanded, generated
+
+
+def _load_manifest(directory):
+    path = os.path.join(directory, MANIFEST)
+    if not os.path.exists(path):
+        return None
+    with open(path) as file:
+        return json.load(file)
+
+
+def _save_manifest(directory, manifest):
+    path = os.path.join(directory, MANIFEST)
+    temp_path = path + ".tmp"
+    with open(temp_path, "w") as file:
+        json.dump(manifest, file, indent=1)
+    os.replace(temp_path, path)
+
+
+# Files of an interrupted layer: runs and temporary files, and layers past the manifest's last one
+def _discard_partial(directory, manifest):
+    finished = {os.path.basename(layer_path(directory, depth)) for depth in range(len(manifest["histogram"]))}
+    for name in os.listdir(directory):
+        if name.endswith(".tmp") or name.startswith("run_") or (name.startswith("layer_") and name not in finished):
+            os.remove(os.path.join(directory, name))
+
+
+# Breadth-first enumeration of every board reachable from `state`, kept in `directory`.
+# Resumes where an earlier call on the same directory stopped; returns the histogram (boards at
+# each depth). chunk_size bounds the boards held in memory at once; max_depth optionally stops
+# after that layer (a later call without it carries on). drop_layers deletes layer files once no
+# longer needed, keeping only the last two.
+def run(state, directory, chunk_size=1 << 22, max_depth=None, drop_layers=False, metrics=None):
+    if metrics is None:
+        metrics = SearchMetrics()
+    n = len(state)
+    start = packed.pack(state)
+    os.makedirs(directory, exist_ok=True)
+    manifest = _load_manifest(directory)
+    if manifest is None:
+        _write_atomic(layer_path(directory, 0), array("Q", [start]))
+        manifest = {"n": n, "start": start, "histogram": [1], "complete": False, "dropped": 0}
+        _save_manifest(directory, manifest)
+    elif manifest["n"] != n or manifest["start"] != start:
+        raise ValueError("The directory " + directory + " holds a search from another board")
+    _discard_partial(directory, manifest)
+
+    histogram = manifest["histogram"]
+    # Boards found before this call, whose generation is not counted again
+    resumed = sum(histogram) - 1
+    expanded = generated = peak_buffer = 0
+    metrics.mark("search")
+    while not manifest["complete"] and (max_depth is None or len(histogram) <= max_depth):
+        depth = len(histogram) - 1
+        size, layer_expanded, layer_generated = _next_layer(directory, depth, n, chunk_size)
+        expanded += layer_expanded
+        generated += layer_generated
+        if size:
+            histogram.append(size)
+        else:
+            os.remove(layer_path(directory, depth + 1))
+            manifest["complete"] = True
+        _save_manifest(directory, manifest)
+        # Old layers go only once the manifest no longer needs them to redo the next layer
+        if drop_layers and depth >= 1:
+            for old in range(manifest["dropped"], depth):
+                if os.path.exists(layer_path(directory, old)):
+                    os.remove(layer_path(directory, old))
+            manifest["dropped"] = depth
+            _save_manifest(directory, manifest)
+        visited = sum(histogram)
+        peak_buffer = max(peak_buffer, min(layer_generated, chunk_size))
+        metrics.record(expanded, generated, generated - (visited - 1 - resumed), histogram[-1], visited,
+                       max(histogram), peak_buffer)
+    return list(histogram)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m puzzle_solver.external",
+                                     description="Disk-backed breadth-first enumeration from the goal, resumable.")
+    parser.add_argument("directory", help="working directory for the layer files and the manifest")
+    parser.add_argument("-n", type=int, default=3, help="board width (default: 3)")
+    parser.add_argument("--chunk-size", type=int, default=1 << 22,
+                        help="boards held in memory per run file (default: 4194304)")
+    parser.add_argument("--max-depth", type=int, default=None, help="stop after this layer")
+    parser.add_argument("--drop-layers", action="store_true", help="delete layers no longer needed")
+    args = parser.parse_args(argv)
+
+    goal = [list(range(i * args.n, (i + 1) * args.n)) for i in range(args.n)]
+    metrics = SearchMetrics(lambda m: print("layer done, " + str(m.visited) + " boards so far", file=sys.stderr))
+    begin = time.perf_counter()
+    histogram = run(goal, args.directory, args.chunk_size, args.max_depth, args.drop_layers, metrics)
+    for depth, count in enumerate(histogram):
+        print(str(depth).rjust(3) + " " + str(count).rjust(15))
+    print(str(sum(histogram)) + " boards in " + str(len(histogram)) + " layers, " +
+          format(time.perf_counter() - begin, ".1f") + " s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,300 @@
+import math
+
+# Precomputed heuristic tables: table[tile][cell] is the distance of `tile` from its goal cell
+# when it sits in `cell`. The default goal has tile t in cell t (row-major) and the blank first;
+# any other goal can be given as a flat tuple of tiles.
+# The blank is not a tile and always contributes 0, which keeps both heuristics admissible.
+
+_tables = {}
+
+
+def _build_table(n, distance, goal):
+    goal_cell = {tile: cell for cell, tile in enumerate(goal)}
+    table = []
+    for tile in range(n * n):
+        goal_row, goal_col = divmod(goal_cell[tile], n)
+        row = []
+        for cell in range(n * n):
+            i, j = divmod(cell, n)
+            row.append(distance(i - goal_row, j - goal_col) if tile != 0 else 0)
+        table.append(tuple(row))
+    return tuple(table)
+
+
+# Manhattan distance of every tile from every cell
+def manhattan_table(n=3, goal=None):
+    goal = tuple(range(n * n)) if goal is None else tuple(goal)
+    key = ("manhattan", n, goal)
+    if key not in _tables:
+        _tables[key] = _build_table(n, lambda di, dj: abs(di) + abs(dj), goal)
+    return _tables[key]
+
+
+# Euclidean distance of every tile from every cell
+def euclidean_table(n=3, goal=None):
+    goal = tuple(range(n * n)) if goal is None else tuple(goal)
+    key = ("euclidean", n, goal)
+    if key not in _tables:
+        _tables[key] = _build_table(n, lambda di, dj: math.sqrt(di * di + dj * dj), goal)
+    return _tables[key]
+
+
+# Full evaluation of a list-of-lists board, used once for the start node
+def evaluate(table, state):
+    n = len(state)
+    cost = 0
+    for i in range(n):
+        for j in range(n):
+            cost += table[state[i][j]][i * n + j]
+    return cost
+
+
+# Incremental update: only `tile` moved, from `from_cell` to `to_cell`
+def move_delta(table, tile, from_cell, to_cell):
+    distances = table[tile]
+    return distances[to_cell] - distances[from_cell]
+
+
+# Heuristic registry.
+# A heuristic has evaluate(state) for a whole list-of-lists board, update(h, state, tile, from_cell,
+# to_cell) for a child whose only change is `tile` sliding from `from_cell` to `to_cell` (`state`
+# is the child, `h` the parent's value), and `integer`, which lets A* use a bucket queue.
+# PuzzleState.costType may be a registered name or one of the legacy integer codes.
+
+_registry = {}
+_cost_types = {}
+# Modules that register further built-in heuristics when imported
+_builtin_modules = ["puzzle_solver.pdb"]
+
+
+def _load_builtins():
+    import importlib
+    while _builtin_modules:
+        importlib.import_module(_builtin_modules.pop())
+
+
+def register(name, heuristic, cost_type=None):
+    _registry[name] = heuristic
+    if cost_type is not None:
+        _cost_types[cost_type] = name
+    return heuristic
+
+
+# Raises ValueError for names that are not registered
+def get(name):
+    # A heuristic object is passed through, so engines can be given a goal-specific one
+    if hasattr(name, "evaluate"):
+        return name
+    _load_builtins()
+    key = _cost_types.get(name, name)
+    if key not in _registry:
+        raise ValueError("Unknown heuristic " + repr(name) + ", expected one of " + ", ".join(names()))
+    return _registry[key]
+
+
+# The heuristic `name` measured against `goal_state` instead of the standard goal.
+# Only the per-tile distance tables can be rebuilt for any goal; the others raise ValueError.
+# Goals with the blank in a corner never need this, see relabel.py.
+def for_goal(name, goal_state):
+    heuristic = get(name)
+    goal = tuple(tile for row in goal_state for tile in row)
+    if goal == tuple(range(len(goal))):
+        return heuristic
+    if not hasattr(heuristic, "for_goal"):
+        raise ValueError("The " + str(name) + " heuristic is built for the standard goal; goals with the blank "
+                         "outside the corners need manhattan or euclidean")
+    return heuristic.for_goal(goal)
+
+
+# Registered heuristic names, in registration order
+def names():
+    _load_builtins()
+    return list(_registry)
+
+
+class TableHeuristic:
+    # Sum of per-tile distances read from a table[tile][cell] built by `table_for(n)`
+    def __init__(self, table_for, integer):
+        self.table_for = table_for
+        self.integer = integer
+        self._tables = {}
+
+    def table(self, n):
+        table = self._tables.get(n)
+        if table is None:
+            table = self._tables[n] = self.table_for(n)
+        return table
+
+    # The same distances measured to the cells of a flat goal
+    def for_goal(self, goal):
+        return TableHeuristic(lambda n: self.table_for(n, goal), self.integer)
+
+    def evaluate(self, state):
+        return evaluate(self.table(len(state)), state)
+
+    def update(self, h, state, tile, from_cell, to_cell):
+        return h + move_delta(self.table(len(state)), tile, from_cell, to_cell)
+
+
+# Twice the number of tiles that must leave a line so the rest of its goal-line tiles are in order
+def _line_conflicts(tiles, goal_line, n, by_row):
+    order = []
+    for tile in tiles:
+        if tile and (tile // n if by_row else tile % n) == goal_line:
+            order.append(tile % n if by_row else tile // n)
+    longest = [1] * len(order)
+    for k in range(len(order)):
+        for m in range(k):
+            if order[m] < order[k] and longest[m] + 1 > longest[k]:
+                longest[k] = longest[m] + 1
+    return 2 * (len(order) - max(longest, default=0))
+
+
+class LinearConflictHeuristic:
+    # Manhattan distance plus linear conflicts, with the conflicts of every possible row and column
+    # content precomputed, so evaluation is one Manhattan sum and 2n dictionary reads.
+    # A move changes the content of two columns (horizontal move) or two rows (vertical move) only.
+    integer = True
+
+    def __init__(self):
+        self._tables = {}
+
+    def tables(self, n):
+        tables = self._tables.get(n)
+        if tables is None:
+            from itertools import permutations
+            contents = list(permutations(range(n * n), n))
+            rows = [{tiles: _line_conflicts(tiles, line, n, True) for tiles in contents} for line in range(n)]
+            columns = [{tiles: _line_conflicts(tiles, line, n, False) for tiles in contents} for line in range(n)]
+            tables = self._tables[n] = (manhattan_table(n), rows, columns)
+        return tables
+
+    def evaluate(self, state):
+        n = len(state)
+        table, rows, columns = self.tables(n)
+        cost = evaluate(table, state)
+        for i in range(n):
+            cost += rows[i][tuple(state[i])]
+        for j in range(n):
+            cost += columns[j][tuple(state[i][j] for i in range(n))]
+        return cost
+
+    def update(self, h, state, tile, from_cell, to_cell):
+        n = len(state)
+        table, rows, columns = self.tables(n)
+        h += move_delta(table, tile, from_cell, to_cell)
+        from_i, from_j = divmod(from_cell, n)
+        to_i, to_j = divmod(to_cell, n)
+        if from_i == to_i:
+            # Horizontal move: the two columns change, every row keeps its tiles in the same order
+            for j in (from_j, to_j):
+                child = [state[i][j] for i in range(n)]
+                parent = child.copy()
+                parent[from_i] = tile if j == from_j else 0
+                h += columns[j][tuple(child)] - columns[j][tuple(parent)]
+        else:
+            for i in (from_i, to_i):
+                child = state[i]
+                parent = child.copy()
+                parent[from_j] = tile if i == from_i else 0
+                h += rows[i][tuple(child)] - rows[i][tuple(parent)]
+        return h
+
+
+class WalkingDistanceHeuristic:
+    # Walking distance: how many moves the blank needs when only the row (resp. column) each tile
+    # belongs to matters. A configuration is the n x n count matrix "tiles of goal line g in line r"
+    # plus the blank's line; one BFS from the goal configuration gives every configuration's
+    # distance, and the heuristic is the vertical plus the horizontal value.
+    # A vertical move only changes the vertical configuration, by one tile between two rows, and a
+    # horizontal move only the horizontal one, so update() looks up that one value for the parent
+    # and the child.
+    integer = True
+
+    def __init__(self):
+        self._tables = {}
+
+    def table(self, n):
+        table = self._tables.get(n)
+        if table is None:
+            table = self._tables[n] = self._build(n)
+        return table
+
+    @staticmethod
+    def _build(n):
+        goal = [[n if line == g else 0 for g in range(n)] for line in range(n)]
+        goal[0][0] -= 1
+        start = (tuple(tuple(line) for line in goal), 0)
+        distances = {start: 0}
+        layer = [start]
+        depth = 0
+        while layer:
+            depth += 1
+            next_layer = []
+            for counts, blank_line in layer:
+                for line in (blank_line - 1, blank_line + 1):
+                    if not 0 <= line < n:
+                        continue
+                    for g in range(n):
+                        if counts[line][g] == 0:
+                            continue
+                        child = [list(row) for row in counts]
+                        child[line][g] -= 1
+                        child[blank_line][g] += 1
+                        key = (tuple(tuple(row) for row in child), line)
+                        if key not in distances:
+                            distances[key] = depth
+                            next_layer.append(key)
+            layer = next_layer
+        return distances
+
+    # Count matrix of the rows (by_row) or columns of a board: counts[line][g] is the number of
+    # tiles of goal line g in that line
+    @staticmethod
+    def _counts(state, n, by_row):
+        counts = [[0] * n for _ in range(n)]
+        for i in range(n):
+            for j in range(n):
+                tile = state[i][j]
+                if tile:
+                    if by_row:
+                        counts[i][tile // n] += 1
+                    else:
+                        counts[j][tile % n] += 1
+        return counts
+
+    def _value(self, table, counts, blank_line):
+        return table[(tuple(tuple(line) for line in counts), blank_line)]
+
+    def evaluate(self, state):
+        n = len(state)
+        table = self.table(n)
+        for i in range(n):
+            for j in range(n):
+                if state[i][j] == 0:
+                    blank_row, blank_col = i, j
+        return (self._value(table, self._counts(state, n, True), blank_row) +
+                self._value(table, self._counts(state, n, False), blank_col))
+
+    def update(self, h, state, tile, from_cell, to_cell):
+        n = len(state)
+        table = self.table(n)
+        from_i, from_j = divmod(from_cell, n)
+        to_i, to_j = divmod(to_cell, n)
+        by_row = from_i != to_i
+        if by_row:
+            from_line, to_line, goal_line = from_i, to_i, tile // n
+        else:
+            from_line, to_line, goal_line = from_j, to_j, tile % n
+        # The child has the tile in to_line and the blank in from_line; the parent the other way round
+        counts = self._counts(state, n, by_row)
+        child = self._value(table, counts, from_line)
+        counts[to_line][goal_line] -= 1
+        counts[from_line][goal_line] += 1
+        return h + child - self._value(table, counts, to_line)
+
+
+register("manhattan", TableHeuristic(manhattan_table, integer=True), cost_type=1)
+register("euclidean", TableHeuristic(euclidean_table, integer=False), cost_type=2)
+register("linear_conflict", LinearConflictHeuristic())
+register("walking_distance", WalkingDistanceHeuristic())
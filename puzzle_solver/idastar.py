@@ -0,0 +1,191 @@
+from puzzle_solver import heuristics, packed, validation
+from puzzle_solver.metrics import SearchMetrics
+
+# Iterative-deepening A* for NxN boards.
+# Memory is linear in the solution depth: one flat board is mutated in place, the Manhattan
+# distance is updated from the moved tile only, and the move that would undo the previous one
+# is never generated.
+# Counters go to an optional metrics.SearchMetrics: the frontier is the current depth, and the only
+# pruned duplicates are the undo moves (exactly one per expansion below each root).
+
+FOUND = -1
+
+
+# Replaying the moves from the initial state to get the (state, move) path format of search.get_path
+def replay(initial_state, moves):
+    state = [row.copy() for row in initial_state]
+    i, j = next((i, j) for i, row in enumerate(state) for j, tile in enumerate(row) if tile == 0)
+    path = [([row.copy() for row in state], None)]
+    for move in moves:
+        new_i, new_j = i + move[0], j + move[1]
+        state[i][j], state[new_i][new_j] = state[new_i][new_j], state[i][j]
+        i, j = new_i, new_j
+        path.append(([row.copy() for row in state], move))
+    return path
+
+
+# IDA* Search; goal_state defaults to the board with tile t in cell t and the blank first.
+# max_depth optionally caps the cost bound, after which the search gives up and returns None.
+# pdb switches the heuristic from Manhattan to an additive pattern database (standard goal only).
+def ida_star(initial_state, goal_state=None, max_depth=None, table=None, pdb=None, metrics=None):
+    if metrics is None:
+        metrics = SearchMetrics()
+    n = len(initial_state)
+    # An unsolvable board would make the bound grow forever
+    validation.validate(initial_state, goal_state or [list(range(i * n, (i + 1) * n)) for i in range(n)])
+    board = [tile for row in initial_state for tile in row]
+    goal = None if goal_state is None else [tile for row in goal_state for tile in row]
+    if pdb is not None:
+        if goal is not None and goal != list(range(n * n)):
+            raise ValueError("Pattern databases are built for the goal with tile t in cell t")
+        return _ida_star_pdb(initial_state, board, pdb, max_depth, metrics)
+    if table is None:
+        table = heuristics.manhattan_table(n, goal)
+    neighbors = packed.neighbor_table(n)
+    moves = []
+    expanded = generated = iterations = deepest = 0
+    interval = metrics.interval
+
+    def search(blank, previous, g, h, bound):
+        nonlocal expanded, generated, deepest, best, best_h
+        if h == 0:
+            return FOUND
+        expanded += 1
+        options = neighbors[blank]
+        generated += len(options)
+        if g > deepest:
+            deepest = g
+        if h < best_h:
+            best_h = h
+            best = board[:]
+        if not expanded % interval:
+            metrics.record(expanded, generated, expanded - iterations, len(moves), 0, deepest, deepest,
+                           [best[i * n:(i + 1) * n] for i in range(n)], best_h)
+        minimum = float("inf")
+        g += 1
+        for target, move in options:
+            if target == previous:
+                continue
+            tile = board[target]
+            distances = table[tile]
+            child_h = h + distances[blank] - distances[target]
+            f = g + child_h
+            if f > bound:
+                if f < minimum:
+                    minimum = f
+                continue
+
+            board[blank] = tile
+            board[target] = 0
+            moves.append(move)
+            result = search(target, blank, g, child_h, bound)
+            if result == FOUND:
+                return FOUND
+            moves.pop()
+            board[target] = tile
+            board[blank] = 0
+            if result < minimum:
+                minimum = result
+        return minimum
+
+    blank = board.index(0)
+    h = sum(table[tile][cell] for cell, tile in enumerate(board))
+    bound = h
+    # Expanded board of lowest h, passed to record() as the best board found so far
+    best = board[:]
+    best_h = h
+    metrics.mark("search")
+    while True:
+        iterations += 1
+        result = search(blank, -1, 0, h, bound)
+        if result == FOUND or result == float("inf") or (max_depth is not None and result > max_depth):
+            break
+        bound = result
+
+    deepest = max(deepest, len(moves))
+    metrics.record(expanded, generated, max(expanded - iterations, 0), len(moves), 0, deepest, deepest)
+    if result != FOUND:
+        return None
+    metrics.cost = len(moves)
+    metrics.mark("path")
+    return replay(initial_state, moves)
+
+
+# Same search with a pattern-database heuristic: only the moved tile's pattern index changes
+def _ida_star_pdb(initial_state, board, pdb, max_depth, metrics):
+    n = pdb.n
+    neighbors = packed.neighbor_table(n)
+    tables = pdb.tables
+    owner = pdb.owner
+    indices = pdb.indices(board)
+    moves = []
+    expanded = generated = iterations = deepest = 0
+    interval = metrics.interval
+
+    def search(blank, previous, g, h, bound):
+        nonlocal expanded, generated, deepest, best, best_h
+        if h == 0:
+            return FOUND
+        expanded += 1
+        options = neighbors[blank]
+        generated += len(options)
+        if g > deepest:
+            deepest = g
+        if h < best_h:
+            best_h = h
+            best = board[:]
+        if not expanded % interval:
+            metrics.record(expanded, generated, expanded - iterations, len(moves), 0, deepest, deepest,
+                           [best[i * n:(i + 1) * n] for i in range(n)], best_h)
+        minimum = float("inf")
+        g += 1
+        for target, move in options:
+            if target == previous:
+                continue
+            tile = board[target]
+            number, weight = owner[tile]
+            values = tables[number]
+            index = indices[number]
+            child_index = index + (blank - target) * weight
+            child_h = h - values[index] + values[child_index]
+            f = g + child_h
+            if f > bound:
+                if f < minimum:
+                    minimum = f
+                continue
+
+            board[blank] = tile
+            board[target] = 0
+            indices[number] = child_index
+            moves.append(move)
+            result = search(target, blank, g, child_h, bound)
+            if result == FOUND:
+                return FOUND
+            moves.pop()
+            indices[number] = index
+            board[target] = tile
+            board[blank] = 0
+            if result < minimum:
+                minimum = result
+        return minimum
+
+    blank = board.index(0)
+    h = pdb.value(board)
+    bound = h
+    best = board[:]
+    best_h = h
+    metrics.mark("search")
+    while True:
+        iterations += 1
+        result = search(blank, -1, 0, h, bound)
+        if result == FOUND or result == float("inf") or (max_depth is not None and result > max_depth):
+            break
+        bound = result
+
+    deepest = max(deepest, len(moves))
+    metrics.record(expanded, generated, max(expanded - iterations, 0), len(moves), 0, deepest, deepest)
+    if result != FOUND:
+        return None
+    metrics.cost = len(moves)
+    metrics.mark("path")
+    return replay(initial_state, moves)
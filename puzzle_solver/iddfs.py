@@ -0,0 +1,138 @@
+from puzzle_solver import packed, validation
+from puzzle_solver.idastar import replay
+from puzzle_solver.metrics import SearchMetrics
+
+# Memory-bounded depth-first search: depth-limited DFS and iterative deepening on top of it.
+# Instead of a visited set, only the states on the current path are checked for cycles, so memory
+# is proportional to the depth limit and the search works on boards whose state space does not fit.
+# The path is kept on an explicit stack, so limits far beyond Python's recursion limit are fine.
+
+# Largest optimal solution length per board width, the natural limit for a plain depth-limited search
+DIAMETERS = {1: 0, 2: 6, 3: 31, 4: 80}
+
+
+# Depth-limited DFS; limit defaults to the board's diameter, which always reaches a solution.
+# Returns the path (not necessarily the shortest), or None if no path of at most `limit` moves exists.
+def depth_limited_dfs(initial_state, goal_state, limit=None, metrics=None):
+    if metrics is None:
+        metrics = SearchMetrics()
+    n = len(initial_state)
+    validation.validate(initial_state, goal_state)
+    validation.check_packable(initial_state)
+    if limit is None:
+        limit = DIAMETERS[n]
+    searcher = _Searcher(initial_state, goal_state, metrics)
+    metrics.mark("search")
+    moves = searcher.search(limit)
+    searcher.record()
+    if moves is None:
+        return None
+    metrics.cost = len(moves)
+    metrics.mark("path")
+    return replay(initial_state, moves)
+
+
+# Iterative-deepening DFS: depth-limited searches with growing limits, so the first path found is a
+# shortest one. Every move flips the parity of the blank's cell, so only limits with the parity of
+# the blank's distance to its goal cell can succeed and the limit grows by 2.
+# max_depth optionally caps the limit, after which the search gives up and returns None.
+def iterative_deepening_dfs(initial_state, goal_state, max_depth=None, metrics=None):
+    if metrics is None:
+        metrics = SearchMetrics()
+    n = len(initial_state)
+    validation.validate(initial_state, goal_state)
+    validation.check_packable(initial_state)
+    searcher = _Searcher(initial_state, goal_state, metrics)
+    goal_blank = packed.blank_index(searcher.goal, n)
+    limit = (abs(searcher.blank // n - goal_blank // n) + abs(searcher.blank % n - goal_blank % n)) % 2
+
+    metrics.mark("search")
+    moves = None
+    while max_depth is None or limit <= max_depth:
+        moves = searcher.search(limit)
+        # Without a cutoff every path was followed to its end, so deeper limits cannot help
+        if moves is not None or not searcher.cutoff:
+            break
+        limit += 2
+    searcher.record()
+    if moves is None:
+        return None
+    metrics.cost = len(moves)
+    metrics.mark("path")
+    return replay(initial_state, moves)
+
+
+class _Searcher:
+    # One depth-first walk over packed states, with counters kept across the iterations
+    def __init__(self, initial_state, goal_state, metrics):
+        self.n = len(initial_state)
+        self.neighbors = packed.neighbor_table(self.n)
+        self.start = packed.pack(initial_state)
+        self.goal = packed.pack(goal_state)
+        self.blank = packed.blank_index(self.start, self.n)
+        self.metrics = metrics
+        self.expanded = 0
+        self.generated = 0
+        self.duplicates = 0
+        self.deepest = 0
+        self.cutoff = False
+
+    # code : the board being expanded, if any
+    def record(self, frontier=0, code=None):
+        self.metrics.record(self.expanded, self.generated, self.duplicates, frontier, frontier, self.deepest,
+                            self.deepest, None if code is None else packed.unpack(code, self.n))
+
+    # Moves of a path of at most `limit` moves to the goal, or None.
+    # self.cutoff tells whether some path was cut short by the limit.
+    def search(self, limit):
+        self.cutoff = False
+        if self.start == self.goal:
+            return []
+        neighbors = self.neighbors
+        goal = self.goal
+        interval = self.metrics.interval
+
+        # codes/blanks/options hold, per depth, the state, its blank cell and the next option to try
+        codes = [self.start]
+        blanks = [self.blank]
+        options = [0]
+        moves = []
+        on_path = {self.start}
+        while codes:
+            depth = len(moves)
+            code = codes[-1]
+            blank = blanks[-1]
+            choices = neighbors[blank]
+            k = options[-1]
+            if depth == limit or k == len(choices):
+                if depth == limit:
+                    self.cutoff = True
+                on_path.remove(code)
+                codes.pop()
+                blanks.pop()
+                options.pop()
+                if moves:
+                    moves.pop()
+                continue
+
+            if k == 0:
+                self.expanded += 1
+                self.generated += len(choices)
+                if depth >= self.deepest:
+                    self.deepest = depth + 1
+                if not self.expanded % interval:
+                    self.record(depth, code)
+            options[-1] = k + 1
+            target, move = choices[k]
+            child = packed.swap(code, blank, target)
+            if child in on_path:
+                self.duplicates += 1
+                continue
+            moves.append(move)
+            if child == goal:
+                return moves
+            on_path.add(child)
+            codes.append(child)
+            blanks.append(target)
+            options.append(0)
+        return None
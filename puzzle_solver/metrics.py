@@ -0,0 +1,104 @@
+import time
+import tracemalloc
+
+# Counters of one search run.
+# The engines keep plain local counters in their hot loops and hand the running totals over with
+# record() every `interval` expansions and once at the end, so an update is O(1) and nothing grows
+# with the number of expansions. Every record() also calls the registered callbacks with the
+# metrics object, which is how progress.Progress watches (and cancels) a search, how budget.Budget
+# stops one and how a caller can feed the numbers into its own monitoring.
+
+
+class SearchMetrics:
+    interval = 1024
+
+    # callback : optional function called with this object on every record()
+    # trace_memory : also measure the peak bytes allocated during the search with tracemalloc
+    def __init__(self, callback=None, trace_memory=False):
+        self.expansions = 0
+        self.generated = 0
+        self.duplicates = 0
+        self.frontier = 0
+        self.visited = 0
+        self.peak_frontier = 0
+        self.peak_visited = 0
+        # Largest frontier + visited held at once
+        self.peak_nodes = 0
+        self.peak_bytes = None
+        # Cost of the solution found by cost-aware engines
+        self.cost = None
+        # Proven suboptimality bound of that solution, for engines that may return longer paths (1.0 = optimal)
+        self.bound = None
+        # Board the engine was expanding at the last record(), as a list of rows; None for the record
+        # that ends a search and for engines that do not say
+        self.current = None
+        # Heuristic value of `current` when the engine passes the board of lowest h it expanded so
+        # far instead, else None
+        self.current_h = None
+        # Phase name --> seconds spent in it
+        self.phases = {}
+        self.callbacks = [] if callback is None else [callback]
+        self.trace_memory = trace_memory
+        self._phase = None
+        self._phase_start = 0.0
+        self._tracing = False
+
+    def add_callback(self, callback):
+        self.callbacks.append(callback)
+
+    # Ending the current phase (if any) and starting `phase`; None just ends the current one
+    def mark(self, phase):
+        now = time.perf_counter()
+        if self._phase is not None:
+            self.phases[self._phase] = self.phases.get(self._phase, 0.0) + now - self._phase_start
+        self._phase = phase
+        self._phase_start = now
+
+    def start(self):
+        if self.trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._tracing = True
+
+    def finish(self):
+        self.mark(None)
+        if self._tracing:
+            self.peak_bytes = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            self._tracing = False
+
+    # Called by the engines with their running totals, the current frontier and visited sizes,
+    # and the peaks they tracked since the start. current is optionally the board being expanded, or
+    # for heuristic engines the board of lowest h expanded so far, with that h as current_h.
+    def record(self, expansions, generated, duplicates, frontier, visited, peak_frontier=0, peak_nodes=0,
+               current=None, current_h=None):
+        self.expansions = expansions
+        self.generated = generated
+        self.duplicates = duplicates
+        self.frontier = frontier
+        self.visited = visited
+        self.peak_frontier = max(self.peak_frontier, peak_frontier, frontier)
+        self.peak_visited = max(self.peak_visited, visited)
+        self.peak_nodes = max(self.peak_nodes, peak_nodes)
+        self.current = current
+        self.current_h = current_h
+        for callback in self.callbacks:
+            callback(self)
+
+    # Flat dict for printing and JSON; nodes_visited and max_nodes_in_memory keep the names the GUIs print
+    def as_dict(self):
+        result = {
+            "nodes_visited": self.expansions,
+            "nodes_generated": self.generated,
+            "duplicates_pruned": self.duplicates,
+            "max_nodes_in_memory": self.peak_nodes,
+            "peak_frontier": self.peak_frontier,
+            "peak_visited": self.peak_visited,
+            "phases": dict(self.phases),
+        }
+        if self.peak_bytes is not None:
+            result["peak_bytes"] = self.peak_bytes
+        if self.cost is not None:
+            result["cost"] = self.cost
+        if self.bound is not None:
+            result["bound"] = self.bound
+        return result
@@ -0,0 +1,136 @@
+import mmap
+import os
+import sys
+import tempfile
+import time
+
+from puzzle_solver import packed, ranking, vectorized
+from puzzle_solver.metrics import SearchMetrics
+
+# Exact-distance oracle for the 3x3 board.
+# One backward BFS from the goal records the optimal distance of every reachable state in a
+# 9!-byte table indexed by permutation rank (255 marks the unreachable half of the permutations).
+# The table is written once and memory-mapped afterwards, so solving is a greedy walk downhill.
+
+GOAL_STATE = [[0, 1, 2], [3, 4, 5], [6, 7, 8]]
+SIZE = 9
+TABLE_SIZE = ranking.state_count(SIZE)
+UNREACHABLE = 255
+DEFAULT_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "distances_3x3.bin")
+
+_loaded = {}
+
+
+# Backward BFS from the goal, writing the distance table to `path`.
+# With NumPy installed the BFS runs a layer at a time (see vectorized.py), about 15 times faster.
+def build_table(path=DEFAULT_PATH):
+    if vectorized.available():
+        table = vectorized.distance_table(GOAL_STATE, UNREACHABLE)
+    else:
+        table = _build_table()
+
+    # Processes building the table at the same time each write their own temp file, and readers
+    # only ever map a finished table
+    _close(path)
+    descriptor, temp_path = tempfile.mkstemp(".tmp", os.path.basename(path) + ".", os.path.dirname(path) or ".")
+    try:
+        with os.fdopen(descriptor, "wb") as file:
+            file.write(table)
+        os.replace(temp_path, path)
+    except BaseException:
+        os.remove(temp_path)
+        raise
+    return path
+
+
+def _build_table():
+    table = bytearray([UNREACHABLE]) * TABLE_SIZE
+    neighbors = packed.neighbor_table(3)
+    goal = packed.pack(GOAL_STATE)
+    table[ranking.rank_code(goal)] = 0
+
+    layer = [(goal, packed.blank_index(goal))]
+    depth = 0
+    while layer:
+        depth += 1
+        next_layer = []
+        for code, blank in layer:
+            blank_shift = blank << 2
+            for target, move in neighbors[blank]:
+                shift = target << 2
+                tile = (code >> shift) & 0xF
+                child = code + (tile << blank_shift) - (tile << shift)
+                index = ranking.rank_code(child)
+                if table[index] == UNREACHABLE:
+                    table[index] = depth
+                    next_layer.append((child, target))
+        layer = next_layer
+    return table
+
+
+def _close(path):
+    table = _loaded.pop(path, None)
+    if table is not None:
+        table.close()
+
+
+# Memory-mapping the table, building it first if it does not exist yet
+def load_table(path=DEFAULT_PATH):
+    table = _loaded.get(path)
+    if table is None:
+        if not os.path.exists(path):
+            build_table(path)
+        with open(path, "rb") as file:
+            table = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        if len(table) != TABLE_SIZE:
+            table.close()
+            raise ValueError("Corrupt distance table: " + path)
+        _loaded[path] = table
+    return table
+
+
+# Optimal number of moves from `state` to the goal, or None if the goal is unreachable
+def distance(state, path=DEFAULT_PATH):
+    value = load_table(path)[ranking.rank_code(packed.pack(state))]
+    return None if value == UNREACHABLE else value
+
+
+# Optimal path by greedy descent over the table, in the same (state, move) format as search.get_path.
+# An optional metrics.SearchMetrics counts the states walked through and the table lookups.
+def solve(initial_state, goal_state=GOAL_STATE, path=DEFAULT_PATH, metrics=None):
+    if goal_state != GOAL_STATE:
+        raise ValueError("The distance table is built for the goal " + str(GOAL_STATE))
+    if metrics is None:
+        metrics = SearchMetrics()
+    table = load_table(path)
+    neighbors = packed.neighbor_table(3)
+
+    metrics.mark("search")
+    code = packed.pack(initial_state)
+    blank = packed.blank_index(code)
+    remaining = table[ranking.rank_code(code)]
+    if remaining == UNREACHABLE:
+        metrics.record(0, 0, 0, 0, 0)
+        return None
+
+    solution = [(packed.unpack(code), None)]
+    generated = 0
+    while remaining:
+        for target, move in neighbors[blank]:
+            child = packed.swap(code, blank, target)
+            generated += 1
+            if table[ranking.rank_code(child)] == remaining - 1:
+                code, blank = child, target
+                remaining -= 1
+                solution.append((packed.unpack(code), move))
+                break
+    expanded = len(solution) - 1
+    metrics.record(expanded, generated, generated - expanded, 1, expanded, 1, len(solution))
+    metrics.cost = expanded
+    return solution
+
+
+if __name__ == "__main__":
+    start = time.time()
+    written = build_table(sys.argv[1] if len(sys.argv) > 1 else DEFAULT_PATH)
+    print("Distance table written to " + written + " in " + str(time.time() - start) + " seconds")
@@ -0,0 +1,374 @@
+from collections import deque
+
+from puzzle_solver import ranking
+from puzzle_solver.metrics import SearchMetrics
+
+# Packed-integer board representation.
+# A board is stored as one int holding 4 bits per cell, cell k (row-major) in bits 4k .. 4k+3.
+# Everything here takes the board width n, so the same code handles boards up to 4x4 (15-puzzle).
+# The engines record their counters in an optional metrics.SearchMetrics.
+
+# Same moves and order as search.get_neighbors, expressed as the direction the blank travels
+MOVES = [(0, 1), (1, 0), (0, -1), (-1, 0)]
+MOVE_INDEX = {move: index for index, move in enumerate(MOVES)}
+
+_neighbor_tables = {}
+_zero_masks = {}
+# Largest rank space compact_bfs allocates dense arrays for (32 MB of visited bits)
+DENSE_RANKS = 1 << 28
+
+
+# Packing a list-of-lists board into an int
+def pack(state):
+    code = 0
+    shift = 0
+    for row in state:
+        for tile in row:
+            code |= tile << shift
+            shift += 4
+    return code
+
+
+# Unpacking an int back into a list-of-lists board
+def unpack(code, n=3):
+    return [[(code >> ((i * n + j) << 2)) & 0xF for j in range(n)] for i in range(n)]
+
+
+# For each blank cell: the (cell the blank moves into, move) pairs that stay on the board
+def neighbor_table(n=3):
+    table = _neighbor_tables.get(n)
+    if table is None:
+        table = []
+        for cell in range(n * n):
+            i, j = divmod(cell, n)
+            options = []
+            for move in MOVES:
+                new_i, new_j = i + move[0], j + move[1]
+                if 0 <= new_i < n and 0 <= new_j < n:
+                    options.append((new_i * n + new_j, move))
+            table.append(tuple(options))
+        table = tuple(table)
+        _neighbor_tables[n] = table
+    return table
+
+
+# Finding the blank cell without scanning: the classic "has zero nibble" trick.
+# (x - 0x11..1) & ~x & 0x88..8 sets the high bit of every zero nibble, and the lowest one is exact.
+def blank_index(code, n=3):
+    masks = _zero_masks.get(n)
+    if masks is None:
+        ones = sum(1 << (k << 2) for k in range(n * n))
+        masks = (ones, ones << 3)
+        _zero_masks[n] = masks
+    ones, highs = masks
+    zero = (code - ones) & ~code & highs
+    return ((zero & -zero).bit_length() - 1) >> 2
+
+
+# Sliding the tile at `target` into the empty cell `blank` (the blank nibble is 0, so add/subtract is enough)
+def swap(code, blank, target):
+    shift = target << 2
+    tile = (code >> shift) & 0xF
+    return code + (tile << (blank << 2)) - (tile << shift)
+
+
+# Getting neighbors of a packed state as (code, new blank cell, move)
+def get_neighbors(code, blank, n=3):
+    return [(swap(code, blank, target), target, move) for target, move in neighbor_table(n)[blank]]
+
+
+class PackedNode:
+    # Lightweight search node: packed board, blank cell, parent node and the move that produced it
+    __slots__ = ("code", "blank", "parent", "action")
+
+    def __init__(self, code, blank, parent=None, action=None):
+        self.code = code
+        self.blank = blank
+        self.parent = parent
+        self.action = action
+
+
+# Getting the solution path in the same (state, move) format as search.get_path
+def get_path(node, n=3):
+    path = []
+    while node is not None:
+        path.append((unpack(node.code, n), node.action))
+        node = node.parent
+    path.reverse()
+    return path
+
+
+# BFS Search on packed states.
+# States are marked visited when queued, so each one is created at most once.
+def bfs(initial_state, goal_state, metrics=None):
+    if metrics is None:
+        metrics = SearchMetrics()
+    n = len(initial_state)
+    table = neighbor_table(n)
+    start = pack(initial_state)
+    goal = pack(goal_state)
+
+    start_node = PackedNode(start, blank_index(start, n))
+    metrics.mark("search")
+    if start == goal:
+        metrics.record(0, 0, 0, 0, 1, 0, 1)
+        metrics.mark("path")
+        return get_path(start_node, n)
+
+    queue = deque([start_node])
+    visited = {start}
+
+    # Every generated child is either new (and then in visited) or a duplicate
+    expanded = generated = peak_frontier = 0
+    interval = metrics.interval
+    while queue:
+        if len(queue) > peak_frontier:
+            peak_frontier = len(queue)
+        current_node = queue.popleft()
+        expanded += 1
+        code = current_node.code
+        if not expanded % interval:
+            metrics.record(expanded, generated, generated - len(visited) + 1, len(queue), len(visited),
+                           peak_frontier, len(visited), unpack(code, n))
+        blank = current_node.blank
+        blank_shift = blank << 2
+
+        options = table[blank]
+        generated += len(options)
+        for target, move in options:
+            shift = target << 2
+            tile = (code >> shift) & 0xF
+            child = code + (tile << blank_shift) - (tile << shift)
+            if child in visited:
+                continue
+            visited.add(child)
+            child_node = PackedNode(child, target, current_node, move)
+            if child == goal:
+                metrics.record(expanded, generated, generated - len(visited) + 1, len(queue), len(visited),
+                               peak_frontier, len(visited))
+                metrics.mark("path")
+                return get_path(child_node, n)
+            queue.append(child_node)
+
+    metrics.record(expanded, generated, generated - len(visited) + 1, 0, len(visited), peak_frontier, len(visited))
+    return None
+
+
+# DFS Search on packed states, exploring in the same order as search.dfs
+def dfs(initial_state, goal_state, metrics=None):
+    if metrics is None:
+        metrics = SearchMetrics()
+    n = len(initial_state)
+    table = neighbor_table(n)
+    start = pack(initial_state)
+    goal = pack(goal_state)
+
+    stack = [PackedNode(start, blank_index(start, n))]
+    visited = set()
+
+    metrics.mark("search")
+    generated = duplicates = peak_frontier = peak_nodes = 0
+    interval = metrics.interval
+    while stack:
+        current_node = stack.pop()
+        if len(stack) > peak_frontier:
+            peak_frontier = len(stack)
+        if len(stack) + len(visited) > peak_nodes:
+            peak_nodes = len(stack) + len(visited)
+        code = current_node.code
+        if code == goal:
+            metrics.record(len(visited), generated, duplicates, len(stack), len(visited), peak_frontier, peak_nodes)
+            metrics.mark("path")
+            return get_path(current_node, n)
+
+        if code in visited:
+            duplicates += 1
+            continue
+        visited.add(code)
+        if not len(visited) % interval:
+            metrics.record(len(visited), generated, duplicates, len(stack), len(visited), peak_frontier, peak_nodes,
+                           unpack(code, n))
+
+        blank = current_node.blank
+        blank_shift = blank << 2
+        for target, move in table[blank]:
+            shift = target << 2
+            tile = (code >> shift) & 0xF
+            child = code + (tile << blank_shift) - (tile << shift)
+            generated += 1
+            if child not in visited:
+                stack.append(PackedNode(child, target, current_node, move))
+            else:
+                duplicates += 1
+
+    metrics.record(len(visited), generated, duplicates, 0, len(visited), peak_frontier, peak_nodes)
+    return None
+
+
+# BFS Search with perfect-hash bookkeeping: visited is one bit per permutation rank and the move
+# that reached each state is a 2-bit entry, so no node objects are kept at all.
+# Above DENSE_RANKS ranks (4x4 boards have 16! of them) the arrays could never be allocated, so a set
+# of reached ranks and a rank --> move dict take their place.
+# The path is rebuilt by walking the recorded moves backwards from the goal.
+def compact_bfs(initial_state, goal_state, metrics=None):
+    if metrics is None:
+        metrics = SearchMetrics()
+    n = len(initial_state)
+    size = n * n
+    table = neighbor_table(n)
+    start = pack(initial_state)
+    goal = pack(goal_state)
+
+    if ranking.state_count(size) <= DENSE_RANKS:
+        visited = ranking.Bitset(ranking.state_count(size))
+        moves = ranking.MoveStore(ranking.state_count(size))
+    else:
+        visited = set()
+        moves = {}
+    visited.add(ranking.rank_code(start, size))
+
+    metrics.mark("search")
+    queue = deque([start])
+    found = start == goal
+    expanded = generated = peak_frontier = 0
+    reached = 1
+    interval = metrics.interval
+    while queue and not found:
+        if len(queue) > peak_frontier:
+            peak_frontier = len(queue)
+        code = queue.popleft()
+        expanded += 1
+        if not expanded % interval:
+            metrics.record(expanded, generated, generated - reached + 1, len(queue), reached, peak_frontier,
+                           len(queue), unpack(code, n))
+        blank = blank_index(code, n)
+        blank_shift = blank << 2
+        options = table[blank]
+        generated += len(options)
+        for target, move in options:
+            shift = target << 2
+            tile = (code >> shift) & 0xF
+            child = code + (tile << blank_shift) - (tile << shift)
+            index = ranking.rank_code(child, size)
+            if index in visited:
+                continue
+            visited.add(index)
+            reached += 1
+            moves[index] = MOVE_INDEX[move]
+            if child == goal:
+                found = True
+                break
+            queue.append(child)
+
+    # Only the queue holds states; visited and moves are fixed-size arrays
+    metrics.record(expanded, generated, generated - reached + 1, len(queue), reached, peak_frontier, peak_frontier)
+    if not found:
+        return None
+
+    # Undoing the recorded moves from the goal back to the start
+    metrics.mark("path")
+    path = []
+    code = goal
+    while code != start:
+        move = MOVES[moves[ranking.rank_code(code, size)]]
+        path.append((unpack(code, n), move))
+        blank = blank_index(code, n)
+        code = swap(code, blank, blank - move[0] * n - move[1])
+    path.append((unpack(start, n), None))
+    path.reverse()
+    return path
+
+
+# Bidirectional BFS Search: whole layers are grown alternately from the start and from the goal
+# (always the smaller frontier) until they meet, so each side only reaches about half the depth.
+# Each side maps a packed state to the move that reached it, and the path is stitched from both halves.
+def bidirectional_bfs(initial_state, goal_state, metrics=None):
+    if metrics is None:
+        metrics = SearchMetrics()
+    n = len(initial_state)
+    table = neighbor_table(n)
+    start = pack(initial_state)
+    goal = pack(goal_state)
+
+    forward = {start: None}
+    backward = {goal: None}
+    forward_layer = [start]
+    backward_layer = [goal]
+    expanded = generated = 0
+    peak_frontier = 2
+    meeting = start if start == goal else None
+
+    metrics.mark("search")
+    while meeting is None and forward_layer and backward_layer:
+        if len(forward_layer) <= len(backward_layer):
+            layer_size = len(forward_layer)
+            forward_layer, meetings, generated = _expand_layer(forward_layer, forward, backward, table, n, metrics,
+                                                               expanded, generated)
+        else:
+            layer_size = len(backward_layer)
+            # Boards of the backward side are measured from the goal, so a forward board is recorded
+            backward_layer, meetings, generated = _expand_layer(backward_layer, backward, forward, table, n,
+                                                                metrics, expanded, generated, forward_layer[0])
+        expanded += layer_size
+        peak_frontier = max(peak_frontier, len(forward_layer) + len(backward_layer))
+        # Several states of the layer can touch the other side; the shortest stitched path wins
+        if meetings:
+            meeting = min(meetings, key=lambda code: len(_trace(forward, code, n)) + len(_trace(backward, code, n)))
+
+    # Both sides keep every state they reached
+    reached = len(forward) + len(backward)
+    metrics.record(expanded, generated, generated - reached + 2, len(forward_layer) + len(backward_layer), reached,
+                   peak_frontier, reached)
+    if meeting is None:
+        return None
+
+    # Start --> meeting as recorded, then meeting --> goal by undoing the backward moves
+    metrics.mark("path")
+    path = [(unpack(code, n), move) for code, move in reversed(_trace(forward, meeting, n))]
+    path[0] = (path[0][0], None)
+    backward_steps = _trace(backward, meeting, n)
+    for (code, move), (next_code, next_move) in zip(backward_steps, backward_steps[1:]):
+        path.append((unpack(next_code, n), (-move[0], -move[1])))
+    return path
+
+
+# Expanding one whole layer of a bidirectional search, continuing the expanded and generated totals.
+# Returns the next layer, the new states that the other side has already reached and the generated total.
+# sample, if given, is the board recorded as the current one instead of the board being expanded.
+def _expand_layer(layer, seen, other, table, n, metrics, expanded, generated, sample=None):
+    next_layer = []
+    meetings = []
+    interval = metrics.interval
+    for count, code in enumerate(layer, expanded + 1):
+        if not count % interval:
+            reached = len(seen) + len(other)
+            frontier = len(layer) - count + expanded + len(next_layer)
+            metrics.record(count, generated, generated - reached + 2, frontier, reached, frontier, reached,
+                           unpack(code if sample is None else sample, n))
+        blank = blank_index(code, n)
+        blank_shift = blank << 2
+        options = table[blank]
+        generated += len(options)
+        for target, move in options:
+            shift = target << 2
+            tile = (code >> shift) & 0xF
+            child = code + (tile << blank_shift) - (tile << shift)
+            if child in seen:
+                continue
+            seen[child] = move
+            if child in other:
+                meetings.append(child)
+            next_layer.append(child)
+    return next_layer, meetings, generated
+
+
+# (state, move that reached it) pairs from `code` back to the root of its side of the search
+def _trace(seen, code, n):
+    steps = []
+    while True:
+        move = seen[code]
+        steps.append((code, move))
+        if move is None:
+            return steps
+        blank = blank_index(code, n)
+        code = swap(code, blank, blank - move[0] * n - move[1])
@@ -0,0 +1,197 @@
+import mmap
+import os
+import sys
+import tempfile
+import time
+from array import array
+
+from puzzle_solver import heuristics, packed
+
+# Disjoint additive pattern databases.
+# The tiles are split into disjoint patterns. For each pattern a retrograde search from the goal
+# runs over the placements of its tiles together with the blank's cell, the other tiles being
+# indistinguishable. Moving the blank through those other tiles is free and sliding a pattern tile
+# into the blank costs 1, so the search is a 0-1 BFS. The table keeps, for every placement, the
+# fewest pattern-tile moves over all blank cells.
+# Every real move moves exactly one tile of one pattern, so the per-pattern values can be added
+# and the sum is still admissible. It never falls below the Manhattan distance of the same tiles.
+# Tracking the blank is what makes the tables strong: a pattern tile can only move where the blank
+# gets to without passing through the pattern. On 4x4 boards IDA* expands about 100 times fewer
+# nodes than with Manhattan distance.
+#
+# A placement is indexed as sum(cell of k-th tile * cells ** k), so one table is cells ** k bytes,
+# and moving one tile changes only its own pattern's index, by (new cell - old cell) * cells ** k.
+# Tables are written next to this module and memory-mapped lazily on first use. Building the 4x4
+# tables takes a few minutes and about 450 MB once; the 3x3 ones take well under a second.
+# Process pools should build them first in the parent (batch.run does, through api.prepare), so
+# the workers do not each build their own copy at the same time.
+
+PARTITIONS = {
+    3: ((1, 2, 3, 4), (5, 6, 7, 8)),
+    4: ((1, 2, 3, 4, 5, 6), (7, 8, 9, 10, 11, 12), (13, 14, 15)),
+}
+UNSEEN = 255
+# Part of the file names, bumped whenever the table contents change so older tables are rebuilt
+FORMAT = 2
+DEFAULT_DIRECTORY = os.path.dirname(os.path.abspath(__file__))
+
+
+def table_path(n, pattern, directory=DEFAULT_DIRECTORY):
+    return os.path.join(directory, "pdb_" + str(n) + "x" + str(n) + "_" + "-".join(map(str, pattern)) + "_v" +
+                        str(FORMAT) + ".bin")
+
+
+# Retrograde 0-1 BFS over the placements of one pattern and the blank's cell, writing its table to disk.
+# A search state is placement index * cells + blank cell. Free blank moves join the layer being
+# expanded, tile moves go to the next one.
+def build_pattern(n, pattern, directory=DEFAULT_DIRECTORY):
+    cells = n * n
+    weights = [cells ** k for k in range(len(pattern))]
+    neighbors = [[target for target, move in options] for options in packed.neighbor_table(n)]
+    table = bytearray([UNSEEN]) * (cells ** len(pattern))
+    distances = bytearray([UNSEEN]) * (cells ** len(pattern) * cells)
+
+    # The goal holds tile t in cell t and the blank in cell 0
+    start = sum(tile * weight for tile, weight in zip(pattern, weights)) * cells
+    distances[start] = 0
+    layer = array("q", [start])
+    depth = 0
+    while layer:
+        next_layer = array("q")
+        k = 0
+        while k < len(layer):
+            state = layer[k]
+            k += 1
+            # Reached again for free after it was queued for the next layer
+            if distances[state] != depth:
+                continue
+            index, blank = divmod(state, cells)
+            if depth < table[index]:
+                table[index] = depth
+            positions = []
+            rest = index
+            for _ in pattern:
+                rest, cell = divmod(rest, cells)
+                positions.append(cell)
+            for target in neighbors[blank]:
+                if target in positions:
+                    child = (index + (blank - target) * weights[positions.index(target)]) * cells + target
+                    if distances[child] == UNSEEN:
+                        distances[child] = depth + 1
+                        next_layer.append(child)
+                else:
+                    child = index * cells + target
+                    if distances[child] > depth:
+                        distances[child] = depth
+                        layer.append(child)
+        layer = next_layer
+        depth += 1
+
+    # Every builder writes its own temp file, so processes racing on one table never share a file
+    # and readers only map finished tables
+    path = table_path(n, pattern, directory)
+    descriptor, temp_path = tempfile.mkstemp(".tmp", os.path.basename(path) + ".", directory)
+    try:
+        with os.fdopen(descriptor, "wb") as file:
+            file.write(table)
+        os.replace(temp_path, path)
+    except BaseException:
+        os.remove(temp_path)
+        raise
+    return path
+
+
+class PatternDatabase:
+    # Additive PDB heuristic for an n x n board and a partition of its tiles.
+    # Tables are built on first use if they are not on disk yet.
+    integer = True
+
+    def __init__(self, n=3, partition=None, directory=DEFAULT_DIRECTORY):
+        if partition is None and n not in PARTITIONS:
+            raise ValueError("No pattern database partition for " + str(n) + "x" + str(n) + " boards, expected " +
+                             " or ".join(str(size) + "x" + str(size) for size in PARTITIONS))
+        self.n = n
+        self.partition = tuple(tuple(pattern) for pattern in (partition or PARTITIONS[n]))
+        self.directory = directory
+        self._tables = None
+
+        covered = sorted(tile for pattern in self.partition for tile in pattern)
+        if covered != list(range(1, n * n)):
+            raise ValueError("A partition must cover every tile from 1 to " + str(n * n - 1) + " exactly once")
+
+        # owner[tile] = (pattern number, weight of the tile inside that pattern's index)
+        cells = n * n
+        self.owner = [None] * cells
+        for number, pattern in enumerate(self.partition):
+            for k, tile in enumerate(pattern):
+                self.owner[tile] = (number, cells ** k)
+
+    @property
+    def tables(self):
+        if self._tables is None:
+            tables = []
+            for pattern in self.partition:
+                path = table_path(self.n, pattern, self.directory)
+                if not os.path.exists(path):
+                    build_pattern(self.n, pattern, self.directory)
+                with open(path, "rb") as file:
+                    tables.append(mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ))
+            self._tables = tables
+        return self._tables
+
+    # Per-pattern indices of a flat board (tiles in row-major order)
+    def indices(self, board):
+        result = [0] * len(self.partition)
+        for cell, tile in enumerate(board):
+            if tile:
+                number, weight = self.owner[tile]
+                result[number] += cell * weight
+        return result
+
+    # Heuristic value of a flat board
+    def value(self, board):
+        tables = self.tables
+        return sum(tables[number][index] for number, index in enumerate(self.indices(board)))
+
+    # Heuristic value of a list-of-lists board
+    def evaluate(self, state):
+        return self.value([tile for row in state for tile in row])
+
+    # Heuristic value of a child board; only the moved tile's pattern index changes
+    def update(self, h, state, tile, from_cell, to_cell):
+        number, weight = self.owner[tile]
+        table = self.tables[number]
+        index = self.indices([cell for row in state for cell in row])[number]
+        return h - table[index - (to_cell - from_cell) * weight] + table[index]
+
+
+class PatternDatabases:
+    # The registered pattern_database heuristic: a PatternDatabase per board width, made on first use
+    integer = True
+
+    def __init__(self, directory=DEFAULT_DIRECTORY):
+        self.directory = directory
+        self._databases = {}
+
+    # Raises ValueError for widths without a default partition
+    def for_width(self, n):
+        if n not in self._databases:
+            self._databases[n] = PatternDatabase(n, directory=self.directory)
+        return self._databases[n]
+
+    def evaluate(self, state):
+        return self.for_width(len(state)).evaluate(state)
+
+    def update(self, h, state, tile, from_cell, to_cell):
+        return self.for_width(len(state)).update(h, state, tile, from_cell, to_cell)
+
+
+heuristics.register("pattern_database", PatternDatabases(), cost_type=3)
+
+
+if __name__ == "__main__":
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else 3
+    for pattern in PARTITIONS[size]:
+        start = time.time()
+        written = build_pattern(size, pattern)
+        print("Pattern database written to " + written + " in " + str(time.time() - start) + " seconds")
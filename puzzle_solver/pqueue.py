@@ -0,0 +1,164 @@
+# Priority queues for the informed searches.
+
+
+class IndexedHeap:
+    # Binary min-heap that remembers where every item sits, so membership is O(1)
+    # and push, pop and decrease_key are O(log n).
+    # Items must be hashable; equal items are treated as the same entry.
+    # Ties on priority are broken first-in, first-out.
+    def __init__(self):
+        self.heap = []
+        self.position = {}
+        self.counter = 0
+
+    def __len__(self):
+        return len(self.heap)
+
+    def __bool__(self):
+        return bool(self.heap)
+
+    def __contains__(self, item):
+        return item in self.position
+
+    # The queued item equal to `item` (the one whose parent/cost should be updated)
+    def get(self, item):
+        return self.heap[self.position[item]][2]
+
+    def priority(self, item):
+        return self.heap[self.position[item]][0]
+
+    def push(self, item, priority):
+        entry = [priority, self.counter, item]
+        self.counter += 1
+        self.heap.append(entry)
+        self.position[item] = len(self.heap) - 1
+        self._sift_up(len(self.heap) - 1)
+
+    def pop(self):
+        heap = self.heap
+        last = heap.pop()
+        if not heap:
+            del self.position[last[2]]
+            return last[2]
+        top = heap[0]
+        heap[0] = last
+        self.position[last[2]] = 0
+        del self.position[top[2]]
+        self._sift_down(0)
+        return top[2]
+
+    # Lowering the priority of a queued item; returns False if the new priority is not better
+    def decrease_key(self, item, priority):
+        index = self.position[item]
+        entry = self.heap[index]
+        if priority >= entry[0]:
+            return False
+        entry[0] = priority
+        self._sift_up(index)
+        return True
+
+    def _sift_up(self, index):
+        heap = self.heap
+        position = self.position
+        entry = heap[index]
+        key = (entry[0], entry[1])
+        while index > 0:
+            parent_index = (index - 1) >> 1
+            parent = heap[parent_index]
+            if key >= (parent[0], parent[1]):
+                break
+            heap[index] = parent
+            position[parent[2]] = index
+            index = parent_index
+        heap[index] = entry
+        position[entry[2]] = index
+
+    def _sift_down(self, index):
+        heap = self.heap
+        position = self.position
+        size = len(heap)
+        entry = heap[index]
+        key = (entry[0], entry[1])
+        while True:
+            child_index = 2 * index + 1
+            if child_index >= size:
+                break
+            child = heap[child_index]
+            right_index = child_index + 1
+            if right_index < size:
+                right = heap[right_index]
+                if (right[0], right[1]) < (child[0], child[1]):
+                    child_index = right_index
+                    child = right
+            if key <= (child[0], child[1]):
+                break
+            heap[index] = child
+            position[child[2]] = index
+            index = child_index
+        heap[index] = entry
+        position[entry[2]] = index
+
+
+class BucketQueue:
+    # Dial / bucket queue for integer priorities, used by A* with integer heuristics.
+    # Priorities are (f, -g) pairs, the same tuples search.a_star gives IndexedHeap: lowest f first,
+    # and inside one f bucket the deepest node (largest g) first. Push and pop are O(1) amortized.
+    # decrease_key is lazy: the item is queued again and its older entry is skipped when reached.
+    def __init__(self):
+        self.buckets = []
+        self.entries = {}
+        self.min_f = 0
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __bool__(self):
+        return bool(self.entries)
+
+    def __contains__(self, item):
+        return item in self.entries
+
+    def get(self, item):
+        return self.entries[item][0]
+
+    def priority(self, item):
+        return self.entries[item][1]
+
+    def push(self, item, priority):
+        f, g = priority[0], -priority[1]
+        buckets = self.buckets
+        while len(buckets) <= f:
+            buckets.append([])
+        by_depth = buckets[f]
+        while len(by_depth) <= g:
+            by_depth.append([])
+        by_depth[g].append(item)
+        self.entries[item] = (item, priority)
+        if f < self.min_f:
+            self.min_f = f
+
+    def pop(self):
+        buckets = self.buckets
+        entries = self.entries
+        while self.min_f < len(buckets):
+            by_depth = buckets[self.min_f]
+            while by_depth:
+                stack = by_depth[-1]
+                if not stack:
+                    by_depth.pop()
+                    continue
+                item = stack.pop()
+                entry = entries.get(item)
+                # Skipping entries that were superseded by decrease_key or already popped
+                if entry is None or entry[0] is not item or entry[1] != (self.min_f, 1 - len(by_depth)):
+                    continue
+                del entries[item]
+                return item
+            self.min_f += 1
+        raise IndexError("pop from an empty BucketQueue")
+
+    def decrease_key(self, item, priority):
+        if priority >= self.entries[item][1]:
+            return False
+        self.push(item, priority)
+        return True
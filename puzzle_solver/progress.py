@@ -0,0 +1,32 @@
+import time
+
+# Live progress of a running search, for callers that run it on another thread.
+# A Progress is registered as a metrics.SearchMetrics callback, so it sees the counters every time
+# the engine records them; a watcher (the GUIs poll with root.after) reads them, and cancel() makes
+# the engine stop at its next record.
+
+
+class SearchCancelled(Exception):
+    pass
+
+
+class Progress:
+    def __init__(self):
+        self.nodes_expanded = 0
+        self.frontier_size = 0
+        self.start = time.perf_counter()
+        self.cancelled = False
+
+    def elapsed(self):
+        return time.perf_counter() - self.start
+
+    # Asking the search to stop; it raises SearchCancelled on its own thread
+    def cancel(self):
+        self.cancelled = True
+
+    # Called through SearchMetrics.record
+    def __call__(self, metrics):
+        self.nodes_expanded = metrics.expansions
+        self.frontier_size = metrics.frontier
+        if self.cancelled:
+            raise SearchCancelled("Search cancelled after " + str(metrics.expansions) + " expansions")
@@ -0,0 +1,78 @@
+import math
+
+# Perfect hashing of boards: the Lehmer code (factorial number system) maps a permutation of
+# 0 .. size-1 to a unique integer in [0, size!), and back.
+# Boards can be given as a flat sequence of tiles or as a packed int (see puzzle_solver.packed).
+
+
+# Rank of a flat sequence of tiles
+def rank(cells):
+    size = len(cells)
+    result = 0
+    seen = 0
+    for k, tile in enumerate(cells):
+        result = result * (size - k) + tile - (seen & ((1 << tile) - 1)).bit_count()
+        seen |= 1 << tile
+    return result
+
+
+# Rank of a packed board with `size` cells, without unpacking it
+def rank_code(code, size=9):
+    result = 0
+    seen = 0
+    for k in range(size):
+        tile = (code >> (k << 2)) & 0xF
+        result = result * (size - k) + tile - (seen & ((1 << tile) - 1)).bit_count()
+        seen |= 1 << tile
+    return result
+
+
+# Flat sequence of tiles with the given rank
+def unrank(value, size=9):
+    digits = []
+    for radix in range(1, size + 1):
+        value, digit = divmod(value, radix)
+        digits.append(digit)
+    digits.reverse()
+
+    unused = list(range(size))
+    return [unused.pop(digit) for digit in digits]
+
+
+# Packed board with the given rank
+def unrank_code(value, size=9):
+    code = 0
+    for k, tile in enumerate(unrank(value, size)):
+        code |= tile << (k << 2)
+    return code
+
+
+# Number of ranks for a board with `size` cells
+def state_count(size=9):
+    return math.factorial(size)
+
+
+class Bitset:
+    # One bit per rank, used as a visited / closed set
+    def __init__(self, size):
+        self.bits = bytearray((size + 7) >> 3)
+
+    def __contains__(self, index):
+        return (self.bits[index >> 3] >> (index & 7)) & 1 == 1
+
+    def add(self, index):
+        self.bits[index >> 3] |= 1 << (index & 7)
+
+
+class MoveStore:
+    # Two bits per rank, enough to remember which of the four moves reached a state
+    def __init__(self, size):
+        self.bits = bytearray((size + 3) >> 2)
+
+    def __getitem__(self, index):
+        return (self.bits[index >> 2] >> ((index & 3) << 1)) & 3
+
+    def __setitem__(self, index, value):
+        shift = (index & 3) << 1
+        byte = index >> 2
+        self.bits[byte] = (self.bits[byte] & ~(3 << shift)) | (value << shift)
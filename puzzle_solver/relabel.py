@@ -0,0 +1,66 @@
+# Solving for any goal with the tables built for the standard one (tile t in cell t, blank first).
+# Renaming every tile after the cell it occupies in the goal turns that goal into the standard one.
+# While the blank keeps its name the renaming changes no legal move. So every distance, path and
+# heuristic value of the renamed board against the standard goal holds for the original board
+# against its own goal, and the heuristic tables, the oracle's distance table, the pattern databases
+# and solution caches all carry over unchanged.
+# The blank only keeps its name when the goal has it in the first cell, as the standard goal does.
+# A goal with the blank in another corner is first flipped upside down and/or left to right to
+# bring it there. Flipping keeps every pair of neighbouring cells neighbours, so it changes no
+# distance either; it only mirrors the direction of the moves.
+# For goals with the blank on an edge or in the centre relabeling() returns None, and callers fall
+# back to goal-aware tables (heuristics.for_goal) or reject the goal.
+
+
+# (flip rows, flip columns, tile --> new tile) for `goal_state`, or None when its blank is not in a corner
+def relabeling(goal_state):
+    n = len(goal_state)
+    blank_row = next(i for i, row in enumerate(goal_state) if 0 in row)
+    blank_column = list(goal_state[blank_row]).index(0)
+    if blank_row not in (0, n - 1) or blank_column not in (0, n - 1):
+        return None
+    flip_rows, flip_columns = blank_row != 0, blank_column != 0
+    flat = [tile for row in _flip(goal_state, flip_rows, flip_columns) for tile in row]
+    mapping = [0] * len(flat)
+    for cell, tile in enumerate(flat):
+        mapping[tile] = cell
+    return flip_rows, flip_columns, tuple(mapping)
+
+
+def inverse(mapping):
+    result = [0] * len(mapping)
+    for tile, new_tile in enumerate(mapping):
+        result[new_tile] = tile
+    return tuple(result)
+
+
+def _flip(state, flip_rows, flip_columns):
+    rows = state[::-1] if flip_rows else state
+    return [list(row[::-1]) if flip_columns else list(row) for row in rows]
+
+
+# Board against the standard goal for `state` against the goal of `transform`
+def apply(state, transform):
+    flip_rows, flip_columns, mapping = transform
+    return [[mapping[tile] for tile in row] for row in _flip(state, flip_rows, flip_columns)]
+
+
+# The original board back from a board made by apply()
+def restore(state, transform):
+    flip_rows, flip_columns, mapping = transform
+    original = inverse(mapping)
+    return _flip([[original[tile] for tile in row] for row in state], flip_rows, flip_columns)
+
+
+def restore_move(move, transform):
+    if move is None:
+        return None
+    flip_rows, flip_columns, mapping = transform
+    return (-move[0] if flip_rows else move[0]), (-move[1] if flip_columns else move[1])
+
+
+# Path found for the relabeled board, with the original boards and moves back
+def restore_path(path, transform):
+    if path is None:
+        return None
+    return [(restore(state, transform), restore_move(move, transform)) for state, move in path]
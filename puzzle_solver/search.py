@@ -0,0 +1,248 @@
+from collections import deque
+
+from puzzle_solver import heuristics
+from puzzle_solver.metrics import SearchMetrics
+from puzzle_solver.pqueue import BucketQueue, IndexedHeap
+
+# The original list-of-lists search engines (BFS, DFS and A*), free of any GUI code.
+# Each engine returns the solution path as a list of (state, move) pairs, or None, and records its
+# counters in an optional metrics.SearchMetrics.
+
+
+class PuzzleState:
+    # Each Puzzle State has:
+    # state : which is the shape of the puzzle
+    # parent : which is the node that added this state in the frontier list
+    # action : the move made to get from the parent to this node
+    # costType : to indicate which heuristic to use in case of A* (0--> no cost , 1--> Manhattan , 2--> Euclidean ,
+    #            3--> Pattern database, or the name of any heuristic in puzzle_solver.heuristics)
+    # g : number of moves from the initial state, h : heuristic estimate to the goal, cost : g + h
+    # h can be passed in when the caller already updated it incrementally from the parent's
+    def __init__(self, state, parent=None, action=None, costType=0, h=None):
+        self.state = state
+        self.parent = parent
+        self.action = action
+        self.costType = costType
+        self.g = parent.g + 1 if parent else 0
+        if costType:
+            self.h = heuristics.get(costType).evaluate(self.state) if h is None else h
+            self.cost = self.g + self.h
+
+    # overriding equality function so that two nodes are equal if they have the same puzzle shape
+    def __eq__(self, other):
+        return self.state == other.state
+
+    def __hash__(self):
+        return hash(str(self.state))
+
+    def __str__(self):
+        return str(self.state)
+
+    def __repr__(self):
+        return str(self.state)
+
+    # Overriding the less than function that's used by the heap
+    def __lt__(self, other):
+        if self.cost == other.cost:
+            return self.g > other.g
+        return self.cost < other.cost
+
+    # Calculating Euclidean Distance from node to goal
+    def get_euclidean_distance(self, matrix1):
+        return heuristics.get("euclidean").evaluate(matrix1)
+
+    # Calculating Manhattan Distance from node to goal
+    def get_manhattan_distance(self, matrix1):
+        return heuristics.get("manhattan").evaluate(matrix1)
+
+    # Decreasing the cost of a state in case the parent is changed; the move from the new parent
+    # replaces the old one too
+    def decreaseKey(self, node, action):
+        self.g = node.g + 1
+        self.cost = self.g + self.h
+        self.parent = node
+        self.action = action
+
+
+# BFS Search
+def bfs(initial_state, goal_state, metrics=None):
+    if metrics is None:
+        metrics = SearchMetrics()
+    start_node = PuzzleState(initial_state)
+    goal_node = PuzzleState(goal_state)
+
+    queue = deque([start_node])
+    visited = set()
+
+    metrics.mark("search")
+    generated = duplicates = peak_frontier = peak_nodes = 0
+    while queue:
+        current_node = queue.popleft()
+        peak_frontier = max(peak_frontier, len(queue))
+        peak_nodes = max(peak_nodes, len(queue) + len(visited))
+        if current_node == goal_node:
+            metrics.record(len(visited), generated, duplicates, len(queue), len(visited), peak_frontier, peak_nodes)
+            return _finish(current_node, metrics)
+
+        if current_node not in visited:
+            visited.add(current_node)
+            if not len(visited) % metrics.interval:
+                metrics.record(len(visited), generated, duplicates, len(queue), len(visited), peak_frontier,
+                               peak_nodes, current_node.state)
+
+            neighbors = get_neighbors(current_node.state)
+            for last_move, new_position, neighbor_state, move in neighbors:
+                neighbor_node = PuzzleState(neighbor_state, current_node, move)
+                generated += 1
+                if neighbor_node not in visited:
+                    queue.append(neighbor_node)
+                else:
+                    duplicates += 1
+
+    metrics.record(len(visited), generated, duplicates, len(queue), len(visited), peak_frontier, peak_nodes)
+    return _finish(None, metrics)
+
+
+# DFS Search
+def dfs(initial_state, goal_state, metrics=None):
+    if metrics is None:
+        metrics = SearchMetrics()
+    start_node = PuzzleState(initial_state)
+    goal_node = PuzzleState(goal_state)
+
+    stack = [start_node]
+    visited = set()
+
+    metrics.mark("search")
+    generated = duplicates = peak_frontier = peak_nodes = 0
+    while stack:
+        current_node = stack.pop()
+        peak_frontier = max(peak_frontier, len(stack))
+        peak_nodes = max(peak_nodes, len(stack) + len(visited))
+        if current_node == goal_node:
+            metrics.record(len(visited), generated, duplicates, len(stack), len(visited), peak_frontier, peak_nodes)
+            return _finish(current_node, metrics)
+
+        if current_node not in visited:
+            visited.add(current_node)
+            if not len(visited) % metrics.interval:
+                metrics.record(len(visited), generated, duplicates, len(stack), len(visited), peak_frontier,
+                               peak_nodes, current_node.state)
+
+            neighbors = get_neighbors(current_node.state)
+            for last_move, new_position, neighbor_state, move in neighbors:
+                neighbor_node = PuzzleState(neighbor_state, current_node, move)
+                generated += 1
+                if neighbor_node not in visited:
+                    stack.append(neighbor_node)
+                else:
+                    duplicates += 1
+
+    metrics.record(len(visited), generated, duplicates, len(stack), len(visited), peak_frontier, peak_nodes)
+    return _finish(None, metrics)
+
+
+# A* search; cost is a legacy costType code or a registered heuristic name
+def a_star(initial_state, goal_state, cost, metrics=None):
+    if metrics is None:
+        metrics = SearchMetrics()
+    start_node = PuzzleState(initial_state, costType=cost)
+    goal_node = PuzzleState(goal_state, costType=cost)
+    n = len(initial_state)
+
+    # Integer heuristics let the frontier be a bucket queue indexed by f
+    heuristic = heuristics.get(cost)
+    heap = BucketQueue() if heuristic.integer else IndexedHeap()
+    heap.push(start_node, (start_node.cost, -start_node.g))
+    visited = set()
+
+    metrics.mark("search")
+    generated = duplicates = peak_frontier = peak_nodes = 0
+    # Expanded node of lowest h, passed to record() as the best board found so far
+    best_node = start_node
+    while heap:
+        current_node = heap.pop()
+        peak_frontier = max(peak_frontier, len(heap))
+        peak_nodes = max(peak_nodes, len(heap) + len(visited))
+        if current_node == goal_node:
+            metrics.cost = current_node.cost
+            metrics.record(len(visited), generated, duplicates, len(heap), len(visited), peak_frontier, peak_nodes)
+            return _finish(current_node, metrics)
+
+        if current_node not in visited:
+            visited.add(current_node)
+            if current_node.h < best_node.h:
+                best_node = current_node
+            if not len(visited) % metrics.interval:
+                metrics.record(len(visited), generated, duplicates, len(heap), len(visited), peak_frontier,
+                               peak_nodes, best_node.state, best_node.h)
+
+            neighbors = get_neighbors(current_node.state)
+            for last_move, new_position, neighbor_state, move in neighbors:
+                # Only the tile that slid into the old blank cell changed position
+                tile = neighbor_state[last_move[0]][last_move[1]]
+                h = heuristic.update(current_node.h, neighbor_state, tile, new_position[0] * n + new_position[1],
+                                     last_move[0] * n + last_move[1])
+                neighbor_node = PuzzleState(neighbor_state, current_node, move, costType=cost, h=h)
+                generated += 1
+                if neighbor_node in visited:
+                    duplicates += 1
+                    continue
+                if neighbor_node not in heap:
+                    heap.push(neighbor_node, (neighbor_node.cost, -neighbor_node.g))
+                else:
+                    # Re-parenting the queued node only if this route is cheaper
+                    queued_node = heap.get(neighbor_node)
+                    if neighbor_node.g < queued_node.g:
+                        queued_node.decreaseKey(current_node, move)
+                        heap.decrease_key(queued_node, (queued_node.cost, -queued_node.g))
+                    else:
+                        duplicates += 1
+
+    metrics.record(len(visited), generated, duplicates, len(heap), len(visited), peak_frontier, peak_nodes)
+    return _finish(None, metrics)
+
+
+def _finish(goal_node, metrics):
+    metrics.mark("path")
+    return get_path(goal_node) if goal_node is not None else None
+
+
+# Finding the blank tile position
+def get_blank_position(state):
+    for i, row in enumerate(state):
+        for j, tile in enumerate(row):
+            if tile == 0:
+                return i, j
+
+
+# Getting neighbors of a state
+def get_neighbors(state):
+    n = len(state)
+    i, j = get_blank_position(state)
+    neighbors = []
+
+    # All possible moves
+    moves = [(0, 1), (1, 0), (0, -1), (-1, 0)]
+
+    for move in moves:
+        new_i, new_j = i + move[0], j + move[1]
+
+        # Checking that it's not out of border
+        if 0 <= new_i < n and 0 <= new_j < n:
+            new_state = [row.copy() for row in state]
+            new_state[i][j], new_state[new_i][new_j] = new_state[new_i][new_j], new_state[i][j]
+            neighbors.append(((i, j), (new_i, new_j), new_state, move))
+
+    return neighbors
+
+
+# Getting the solution path
+def get_path(current_node):
+    path = []
+    while current_node.parent:
+        path.append((current_node.state, current_node.action))
+        current_node = current_node.parent
+    path.append((current_node.state, None))
+    path.reverse()
+    return path
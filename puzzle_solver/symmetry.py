@@ -0,0 +1,65 @@
+from puzzle_solver import packed
+
+# Diagonal symmetry of the sliding puzzle.
+# Reflecting a board across the main diagonal sends cell (i, j) to (j, i). Relabeling every tile t
+# with the number of the cell its own goal cell is reflected to keeps the standard goal (tile t in
+# cell t, blank first) unchanged. Any relabeling that keeps the blank at 0 preserves moves, so a
+# board and its mirror are equally far from such a goal. A path for one is a path for the other once
+# every move is transposed.
+# canonical() gives the two boards one shared key, the smaller of their packed codes. Caches and
+# tables keyed on it need about half as many entries.
+
+_transposes = {}
+
+
+# For each cell, the cell it is reflected to; the same table relabels the tiles
+def transpose_table(n=3):
+    table = _transposes.get(n)
+    if table is None:
+        table = tuple((cell % n) * n + cell // n for cell in range(n * n))
+        _transposes[n] = table
+    return table
+
+
+# Mirror image of a list-of-lists board
+def mirror(state):
+    n = len(state)
+    relabel = transpose_table(n)
+    return [[relabel[state[j][i]] for j in range(n)] for i in range(n)]
+
+
+# Mirror image of a packed board
+def mirror_code(code, n=3):
+    table = transpose_table(n)
+    result = 0
+    for cell in range(n * n):
+        result |= table[(code >> (cell << 2)) & 0xF] << (table[cell] << 2)
+    return result
+
+
+def mirror_move(move):
+    return move[1], move[0]
+
+
+# Whether mirroring keeps `goal_code` in place, so that boards and their mirrors may share a key
+def is_symmetric(goal_code, n=3):
+    return mirror_code(goal_code, n) == goal_code
+
+
+# (key, mirrored): the smaller of the code and its mirror, and whether the mirror was taken
+def canonical(code, n=3):
+    image = mirror_code(code, n)
+    if image < code:
+        return image, True
+    return code, False
+
+
+def canonical_state(state):
+    return canonical(packed.pack(state), len(state))
+
+
+# Moves found for the canonical board, turned into moves for the original one
+def restore_moves(moves, mirrored):
+    if not mirrored:
+        return list(moves)
+    return [mirror_move(move) for move in moves]
@@ -0,0 +1,93 @@
+# Board validation, run before any search is launched.
+# Unsolvable boards are the most expensive input for an uninformed search (it exhausts the whole
+# reachable half of the state space before giving up), but inversion parity rejects them in O(n log n).
+
+
+class InvalidBoardError(ValueError):
+    pass
+
+
+class UnsolvableBoardError(InvalidBoardError):
+    pass
+
+
+# Checking that the board is a square list (or tuple) of rows holding every tile 0 .. n*n-1 exactly
+# once, tiles being ints
+def check_board(state):
+    if not isinstance(state, (list, tuple)) or not state:
+        raise InvalidBoardError("The board must be a non-empty list of rows")
+    n = len(state)
+    if any(not isinstance(row, (list, tuple)) or len(row) != n for row in state):
+        raise InvalidBoardError("The board must be square: " + str(n) + " rows of " + str(n) + " tiles")
+    tiles = [tile for row in state for tile in row]
+    if any(not isinstance(tile, int) or isinstance(tile, bool) for tile in tiles):
+        raise InvalidBoardError("The tiles must be integers from 0 to " + str(n * n - 1))
+    if sorted(tiles) != list(range(n * n)):
+        raise InvalidBoardError("The board must hold every tile from 0 to " + str(n * n - 1) + " exactly once")
+
+
+# Packed boards keep 4 bits per tile, so the engines and the cache built on them stop at 4x4.
+# The other engines take any width.
+PACKED_WIDTH = 4
+
+
+def check_packable(state):
+    if len(state) > PACKED_WIDTH:
+        raise InvalidBoardError("Boards larger than 4x4 are not supported by the packed engines")
+
+
+# Copy of a checked board as a list of lists, the form every engine expects
+def normalize(state):
+    return [list(row) for row in state]
+
+
+# Counting inversions among the tiles (blank excluded) with a merge sort
+def count_inversions(tiles):
+    return _merge_count(list(tiles))[1]
+
+
+def _merge_count(tiles):
+    if len(tiles) < 2:
+        return tiles, 0
+    middle = len(tiles) // 2
+    left, left_count = _merge_count(tiles[:middle])
+    right, right_count = _merge_count(tiles[middle:])
+    merged = []
+    inversions = left_count + right_count
+    i = j = 0
+    while i < len(left) and j < len(right):
+        if left[i] <= right[j]:
+            merged.append(left[i])
+            i += 1
+        else:
+            # Every tile still waiting on the left is larger than right[j]
+            merged.append(right[j])
+            inversions += len(left) - i
+            j += 1
+    merged.extend(left[i:])
+    merged.extend(right[j:])
+    return merged, inversions
+
+
+# Parity that no legal move changes: inversions, plus the blank's row on even widths
+def parity(state):
+    n = len(state)
+    tiles = [tile for row in state for tile in row if tile != 0]
+    value = count_inversions(tiles)
+    if n % 2 == 0:
+        value += next(i for i, row in enumerate(state) if 0 in row)
+    return value % 2
+
+
+def is_solvable(state, goal_state):
+    return parity(state) == parity(goal_state)
+
+
+# Validating both boards and rejecting unsolvable pairs before a search starts
+def validate(state, goal_state):
+    check_board(state)
+    check_board(goal_state)
+    if len(state) != len(goal_state):
+        raise InvalidBoardError("The board and the goal must have the same size")
+    if not is_solvable(state, goal_state):
+        raise UnsolvableBoardError("The goal cannot be reached from this board (odd inversion parity)")
@@ -0,0 +1,205 @@
+import argparse
+import sys
+import time
+
+from puzzle_solver import packed, ranking, validation
+from puzzle_solver.metrics import SearchMetrics
+
+# Layer-synchronous BFS on NumPy arrays of packed boards (see packed.py for the encoding).
+# A whole BFS layer is expanded at once. Boards are grouped by blank cell, and for each legal move
+# the sliding tile is extracted, shifted and swapped with a few array operations.
+# Sliding a tile changes the blank's colour on the chessboard, so the state graph is bipartite: the
+# children of layer d lie in layers d - 1 and d + 1 only. np.unique on the children plus one
+# searchsorted against the previous (sorted) layer is the whole duplicate check.
+# Every layer is kept, so a path is traced back by looking each parent up in the layer before.
+#
+#   python -m puzzle_solver.vectorized -n 3      # distance histogram of the whole 3x3 space
+#
+# NumPy is optional: it is imported on first use and available() tells whether it is installed.
+
+_np = None
+
+
+def _numpy():
+    global _np
+    if _np is None:
+        try:
+            import numpy
+        except ImportError:
+            raise ImportError("The vectorized engines need NumPy, install it with pip install numpy") from None
+        _np = numpy
+    return _np
+
+
+def available():
+    try:
+        _numpy()
+    except ImportError:
+        return False
+    return True
+
+
+# Children of every board in `codes` (a uint64 array), duplicates included
+def _expand(codes, n):
+    np = _numpy()
+    zero = np.uint64(0)
+    nibble = np.uint64(0xF)
+    # Only one cell per board is blank, so each board lands in exactly one group
+    blanks = np.empty(len(codes), np.uint8)
+    for cell in range(n * n):
+        blanks[((codes >> np.uint64(cell << 2)) & nibble) == zero] = cell
+
+    children = []
+    for blank, options in enumerate(packed.neighbor_table(n)):
+        group = codes[blanks == blank]
+        if not len(group):
+            continue
+        blank_shift = np.uint64(blank << 2)
+        for target, move in options:
+            shift = np.uint64(target << 2)
+            tile = (group >> shift) & nibble
+            children.append(group + (tile << blank_shift) - (tile << shift))
+    return np.concatenate(children)
+
+
+# Sorted boards of `candidates` that are not in the sorted array `known`
+def _new_only(candidates, known):
+    np = _numpy()
+    if not len(known):
+        return candidates
+    positions = np.searchsorted(known, candidates)
+    positions[positions == len(known)] = 0
+    return candidates[known[positions] != candidates]
+
+
+# BFS layers from the packed board `start`: a list of sorted uint64 arrays, layer d holding every
+# board d moves away. Stops after the layer holding `stop` if it is given, or when the space is
+# exhausted.
+def layers(start, n=3, stop=None, metrics=None):
+    np = _numpy()
+    if metrics is None:
+        metrics = SearchMetrics()
+    result = [np.array([start], np.uint64)]
+    previous = np.empty(0, np.uint64)
+    expanded = generated = duplicates = visited = peak_frontier = 0
+    stop_value = None if stop is None else np.uint64(stop)
+
+    metrics.mark("search")
+    while len(result[-1]):
+        layer = result[-1]
+        visited += len(layer)
+        if stop_value is not None and _contains(layer, stop_value):
+            break
+        children = _expand(layer, n)
+        expanded += len(layer)
+        generated += len(children)
+        children = _new_only(np.unique(children), previous)
+        duplicates = generated - (visited + len(children) - 1)
+        peak_frontier = max(peak_frontier, len(children))
+        previous = layer
+        result.append(children)
+        metrics.record(expanded, generated, duplicates, len(children), visited, peak_frontier,
+                       visited + len(children), packed.unpack(int(layer[0]), n))
+    if not len(result[-1]):
+        result.pop()
+    metrics.record(expanded, generated, duplicates, len(result[-1]), visited, peak_frontier, visited)
+    return result
+
+
+def _contains(layer, value):
+    np = _numpy()
+    position = np.searchsorted(layer, value)
+    return position < len(layer) and layer[position] == value
+
+
+# Breadth-first search with whole layers at a time; returns a shortest path in the (state, move)
+# format of search.get_path, or None if the goal cannot be reached
+def bfs(initial_state, goal_state, metrics=None):
+    if metrics is None:
+        metrics = SearchMetrics()
+    np = _numpy()
+    n = len(initial_state)
+    validation.validate(initial_state, goal_state)
+    validation.check_packable(initial_state)
+    start = packed.pack(initial_state)
+    goal = packed.pack(goal_state)
+    found = layers(start, n, goal, metrics)
+    if not _contains(found[-1], np.uint64(goal)):
+        return None
+
+    # Walking back from the goal: some neighbor of every board in layer d sits in layer d - 1
+    metrics.mark("path")
+    neighbors = packed.neighbor_table(n)
+    code = goal
+    moves = []
+    for depth in range(len(found) - 2, -1, -1):
+        blank = packed.blank_index(code, n)
+        for target, move in neighbors[blank]:
+            parent = packed.swap(code, blank, target)
+            if _contains(found[depth], np.uint64(parent)):
+                moves.append((-move[0], -move[1]))
+                code = parent
+                break
+    moves.reverse()
+    metrics.cost = len(moves)
+
+    path = [(packed.unpack(start, n), None)]
+    code = start
+    blank = packed.blank_index(code, n)
+    for move in moves:
+        target = blank + move[0] * n + move[1]
+        code = packed.swap(code, blank, target)
+        blank = target
+        path.append((packed.unpack(code, n), move))
+    return path
+
+
+# Lehmer ranks (see ranking.rank_code) of a uint64 array of packed boards with `size` cells
+def rank_codes(codes, size=9):
+    np = _numpy()
+    tiles = [((codes >> np.uint64(k << 2)) & np.uint64(0xF)).astype(np.int64) for k in range(size)]
+    result = np.zeros(len(codes), np.int64)
+    for k in range(size):
+        # Tiles after position k that are smaller than the one at k: the k-th Lehmer digit
+        smaller = np.zeros(len(codes), np.int64)
+        for later in tiles[k + 1:]:
+            smaller += later < tiles[k]
+        result = result * (size - k) + smaller
+    return result
+
+
+# Distance of every board to `goal_state` as bytes indexed by rank, `unreachable` where there is none.
+# This is the table oracle.build_table writes for the 3x3 board.
+def distance_table(goal_state, unreachable=255, metrics=None):
+    np = _numpy()
+    n = len(goal_state)
+    size = n * n
+    table = np.full(ranking.state_count(size), unreachable, np.uint8)
+    for depth, layer in enumerate(layers(packed.pack(goal_state), n, metrics=metrics)):
+        table[rank_codes(layer, size)] = depth
+    return table.tobytes()
+
+
+# Number of boards at each distance from `state`, over the whole reachable space
+def histogram(state, metrics=None):
+    return [len(layer) for layer in layers(packed.pack(state), len(state), metrics=metrics)]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m puzzle_solver.vectorized",
+                                     description="Enumerate every board reachable from the goal, layer by layer.")
+    parser.add_argument("-n", type=int, default=3, help="board width (default: 3)")
+    args = parser.parse_args(argv)
+
+    goal = [list(range(i * args.n, (i + 1) * args.n)) for i in range(args.n)]
+    start = time.perf_counter()
+    counts = histogram(goal)
+    elapsed = time.perf_counter() - start
+    for depth, count in enumerate(counts):
+        print(str(depth).rjust(3) + " " + str(count).rjust(12))
+    print(str(sum(counts)) + " boards, " + str(len(counts) - 1) + " moves at most, " + format(elapsed, ".3f") + " s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())